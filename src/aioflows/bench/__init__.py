@@ -0,0 +1,205 @@
+"""Benchmarks of flows, edges and actors.
+
+Each scenario sends `count` events stamped with creation time through
+a flow and reports throughput, latency percentiles and peak RSS along
+with scenario parameters (e.g. depth of chain).
+"""
+import asyncio
+import dataclasses
+import inspect
+import resource
+import socket
+import statistics
+import struct
+import sys
+import time
+
+from aioflows.core import DATA_FINISH_MARKER, Actor, Sink, Source, receiver
+from aioflows.network import Udp
+from aioflows.simple import Applicator, Batcher, Null, Tee, Unbatch
+from aioflows.thread import Thread
+
+
+class Generator(Source, Actor):
+    """Source actor sending timestamps of events creation."""
+
+    @dataclasses.dataclass
+    class Options:
+        count: int = 100000
+        '''Number of events to be sent.'''
+
+    async def main(self):
+        for _ in range(self.config.count):
+            await self.send(time.perf_counter())
+        await self.send(DATA_FINISH_MARKER)
+
+
+class Recorder(Sink, Actor):
+    """Sink actor recording latencies of timestamped events."""
+
+    @dataclasses.dataclass
+    class Options:
+        count: int = None
+        '''Number of events to be recorded before finish (all if unset).'''
+
+    latencies: list = None
+    started: float = None
+    finished: float = None
+    complete: asyncio.Event = None
+
+    async def main(self):
+        self.latencies = []
+        self.started = time.perf_counter()
+        async for chunk in receiver(self.receive, chunk=1024):
+            now = time.perf_counter()
+            self.latencies.extend(now - x for x in chunk)
+            self.finished = now
+            if self.config.count and len(self.latencies) >= self.config.count:
+                break
+        self.complete.set()
+
+    def start(self):
+        self.complete = asyncio.Event()
+        return super().start()
+
+    def report(self, name, count, params=None):
+        received = len(self.latencies)
+        elapsed = (self.finished or self.started) - self.started
+        quantiles = (
+            statistics.quantiles(self.latencies, n=100)
+            if received > 1 else
+            self.latencies * 99 or [0] * 99
+        )
+        return {
+            'scenario': name,
+            'events': count,
+            'params': params or {},
+            'received': received,
+            'seconds': elapsed,
+            'throughput': received / elapsed if elapsed else 0,
+            'p50': quantiles[49],
+            'p99': quantiles[98],
+            'peak_rss': peak_rss(),
+        }
+
+
+def peak_rss():
+    """Returns peak resident set size of process in bytes."""
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage if sys.platform == 'darwin' else usage * 1024
+
+
+def identity(data):
+    return data
+
+
+def echo(getter, putter):
+    while True:
+        data = getter.get_many()
+        putter.put_many(data)
+        if data[-1] is DATA_FINISH_MARKER:
+            return
+
+
+async def chain(count, depth=10):
+    """Linear chain of `depth` interim actors."""
+    recorder = Recorder()
+    flow = Generator(count=count)
+    for _ in range(depth):
+        flow = flow >> Applicator(func=identity)
+    await (flow >> recorder).start()
+    return recorder
+
+
+async def tee(count, branches=4):
+    """Fan-out of events to side branches."""
+    recorder = Recorder()
+    flow = (
+        Generator(count=count)
+        >> Tee(sinks=[Null() for _ in range(branches)])
+        >> recorder
+    )
+    await flow.start()
+    return recorder
+
+
+async def thread(count):
+    """Bridge to thread and back."""
+    recorder = Recorder()
+    await (Generator(count=count) >> Thread(func=echo) >> recorder).start()
+    return recorder
+
+
+async def batcher(count, size=100):
+    """Batching and unbatching of events."""
+    recorder = Recorder()
+    flow = (
+        Generator(count=count)
+        >> Batcher(size=size)
+        >> Unbatch()
+        >> recorder
+    )
+    await flow.start()
+    return recorder
+
+
+async def udp(count):
+    """Datagrams through loopback (lost datagrams are not received)."""
+    stamp = struct.Struct('!d')
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 2 ** 22)
+        addr = sock.getsockname()
+        recorder = Recorder(count=count)
+        receiving = asyncio.ensure_future((
+            Udp(options=dict(sock=sock), capacity=1024, bulk=64)
+            >> Unbatch()
+            >> Applicator(func=lambda x: stamp.unpack(x[0])[0])
+            >> recorder
+        ).start())
+        sending = (
+            Generator(count=count)
+            >> Applicator(func=lambda x: (stamp.pack(x), addr))
+            >> Udp(options=dict(remote_addr=addr))
+        )
+        await asyncio.sleep(0.01)
+        await sending.start()
+        try:
+            await asyncio.wait_for(recorder.complete.wait(), 1)
+        except asyncio.TimeoutError:
+            pass
+        receiving.cancel()
+        await asyncio.wait([receiving])
+    return recorder
+
+
+SCENARIOS = {
+    'chain': chain,
+    'tee': tee,
+    'thread': thread,
+    'batcher': batcher,
+    'udp': udp,
+}
+
+
+def parameters(scenario, options):
+    """Returns parameters of scenario with values from options."""
+    return {
+        name: options[name] if options.get(name) is not None else x.default
+        for name, x in inspect.signature(scenario).parameters.items()
+        if x.default is not inspect.Parameter.empty
+    }
+
+
+async def run(names=None, count=100000, **options):
+    """Runs scenarios one by one and returns their reports.
+
+    Options set parameters of scenarios accepting them (e.g. `depth`),
+    not set (None) ones keep defaults of scenarios.
+    """
+    reports = []
+    for name in names or SCENARIOS:
+        params = parameters(SCENARIOS[name], options)
+        recorder = await SCENARIOS[name](count, **params)
+        reports.append(recorder.report(name, count, params))
+    return reports
@@ -0,0 +1,54 @@
+import argparse
+import asyncio
+import json
+
+from aioflows.bench import SCENARIOS, run
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog='python -m aioflows.bench',
+        description='Runs aioflows benchmarks and prints JSON report.',
+    )
+    parser.add_argument(
+        'scenarios',
+        nargs='*',
+        help=f'scenarios to be run: {", ".join(SCENARIOS)} (all by default)',
+    )
+    parser.add_argument(
+        '-n',
+        '--count',
+        type=int,
+        default=100000,
+        help='number of events per scenario',
+    )
+    parser.add_argument(
+        '--depth',
+        type=int,
+        help='number of interim actors of chain scenario',
+    )
+    parser.add_argument(
+        '--branches',
+        type=int,
+        help='number of side branches of tee scenario',
+    )
+    parser.add_argument(
+        '--size',
+        type=int,
+        help='size of batches of batcher scenario',
+    )
+    args = parser.parse_args()
+    for name in args.scenarios:
+        if name not in SCENARIOS:
+            parser.error(f'unknown scenario: {name}')
+    reports = asyncio.run(run(
+        args.scenarios,
+        args.count,
+        depth=args.depth,
+        branches=args.branches,
+        size=args.size,
+    ))
+    print(json.dumps(reports, indent=2))
+
+
+main()
@@ -0,0 +1,61 @@
+import asyncio
+
+from .core import DATA_FINISH_MARKER
+
+
+class ChannelMixinError(RuntimeError):
+    def __init__(self, mixin):
+        super().__init__(
+            f'flow edge is already instrumented with "{mixin.__name__}"',
+        )
+
+
+def mixed_with(channel, mixin):
+    """Whether channel factory produces channels with mixin.
+
+    Instrumenting factories set `mixin` and `wrapped` (factory of wrapped
+    channel) attributes.
+    """
+    while channel is not None:
+        if getattr(channel, 'mixin', None) is mixin:
+            return True
+        channel = getattr(channel, 'wrapped', None)
+    return False
+
+
+class DropNewestQueue(asyncio.Queue):
+    """Bounded channel dropping incoming events if it is full.
+
+    Finish marker is never dropped: sender waits for free space instead.
+    """
+
+    dropped: int = 0
+
+    async def put(self, item):
+        if self.full() and item is not DATA_FINISH_MARKER:
+            self.dropped += 1
+            return
+        await super().put(item)
+
+
+class DropOldestQueue(asyncio.Queue):
+    """Bounded channel dropping oldest buffered events if it is full.
+
+    Sender is never blocked and channel always contains latest events.
+    """
+
+    dropped: int = 0
+
+    def put_nowait(self, item):
+        if self.full():
+            self._get()
+            self.task_done()
+            self.dropped += 1
+        super().put_nowait(item)
+
+    async def put(self, item):
+        self.put_nowait(item)
+
+
+RingQueue = DropOldestQueue
+'''Ring buffer of fixed capacity overwriting oldest events.'''
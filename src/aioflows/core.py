@@ -3,21 +3,105 @@ import asyncio
 import copy
 import dataclasses
 import functools
+import inspect
+from typing import Callable, Optional
 
 import pydantic
 
 
 DATA_FINISH_MARKER = object()
+CHUNK_SIZE = 1024
 
 
-async def receiver(receive):
+async def resolve(data):
+    """Awaits data if it is awaitable."""
+    if inspect.isawaitable(data):
+        data = await data
+    return data
+
+
+def queue_of(method, name):
+    """Returns asyncio.Queue if method is its `name` method."""
+    queue = getattr(method, '__self__', None)
+    if isinstance(queue, asyncio.Queue) and method == getattr(queue, name):
+        return queue
+    return None
+
+
+async def receive_many(receive, limit=CHUNK_SIZE):
+    """Receive chunk of events in one await.
+
+    Waits for the first event and takes all other events already
+    available in the channel (up to limit). Finish marker is always the
+    last event of the chunk. Falls back to single event chunks if getter
+    is not asyncio.Queue compatible.
+    """
+    queue = queue_of(receive, 'get')
+    if queue is None:
+        return [await resolve(receive())]
+    data = await queue.get() if queue.empty() else queue.get_nowait()
+    result = [data]
+    while (
+        data is not DATA_FINISH_MARKER
+        and len(result) < limit
+        and not queue.empty()
+    ):
+        data = queue.get_nowait()
+        result.append(data)
+    return result
+
+
+async def send_many(send, values):
+    """Send chunk of events.
+
+    Puts events into asyncio.Queue compatible channel without
+    awaiting while there is free space in it.
+    """
+    queue = queue_of(send, 'put')
+    if queue is None:
+        for value in values:
+            await resolve(send(value))
+        return
+    for value in values:
+        if queue.full():
+            await queue.put(value)
+        else:
+            queue.put_nowait(value)
+
+
+async def receiver(receive, chunk=None):
+    """Iterate over incoming events until finish marker.
+
+    Args:
+        receive: getter function or Sink.receive method
+        chunk: if set, yields lists of up to chunk events received
+            in one await instead of single events
+    """
+    owner = getattr(receive, '__self__', None)
+    if isinstance(owner, Sink) and receive.__func__ is Sink.receive:
+        # use channel directly to be able to detect its type
+        receive = owner.getter
+    if chunk is not None:
+        while True:
+            data = await receive_many(receive, chunk)
+            if data[-1] is DATA_FINISH_MARKER:
+                if data[:-1]:
+                    yield data[:-1]
+                return
+            yield data
+    queue = queue_of(receive, 'get')
+    if queue is not None:
+        # fast path: take ready data without awaiting and suspend
+        # on queue directly only if it is empty
+        while True:
+            data = await queue.get() if queue.empty() else queue.get_nowait()
+            if data is DATA_FINISH_MARKER:
+                break
+            yield data
+        return
     while True:
-        data = receive()
-        if asyncio.iscoroutine(data):
-            data = asyncio.ensure_future(data)
-        if asyncio.isfuture(data):
-            data = await data
-        if data == DATA_FINISH_MARKER:
+        data = await resolve(receive())
+        if data is DATA_FINISH_MARKER:
             break
         yield data
 
@@ -56,6 +140,13 @@ class ActorConfigurationError(RuntimeError):
         )
 
 
+class ActorOptionValueError(RuntimeError):
+    def __init__(self, option, value):
+        super().__init__(
+            f'actor option "{option}" has unsupported value: "{value}"',
+        )
+
+
 class ActorMeta(abc.ABCMeta):
     """Helper class to implement syntactic sugar for actors."""
     def __new__(cls, name, bases, dct):
@@ -144,6 +235,25 @@ class Actor(abc.ABC, metaclass=ActorMeta):
         """
         return Connector(left=self, right=other, cancel=True)
 
+    def connect(self, other, **kwargs):
+        """Connect actors with specific edge arguments.
+
+        Creates new Actor representing connection of arguments.
+
+        Args:
+            other: right hand side Actor to join
+            kwargs: Connector arguments, e.g. capacity, channel or cancel
+
+        Returns:
+            A new Actor representing connected flow of join
+            operation arguments. Can be used in further join
+            operations or started alone if completed.
+        """
+        return Connector(left=self, right=other, **kwargs)
+
+    def __repr__(self):
+        return type(self).__name__
+
     @property
     def options(self):
         if hasattr(self, 'Options'):
@@ -161,19 +271,9 @@ class Actor(abc.ABC, metaclass=ActorMeta):
 
     @staticmethod
     async def mover(getter, putter):
-        while True:
-            data = getter()
-            if asyncio.iscoroutine(data):
-                data = asyncio.ensure_future(data)
-            if asyncio.isfuture(data):
-                data = await data
-            result = putter(data)
-            if asyncio.iscoroutine(result):
-                result = asyncio.ensure_future(result)
-            if asyncio.isfuture(result):
-                result = await result
-            if data is DATA_FINISH_MARKER:
-                break
+        async for data in receiver(getter):
+            await resolve(putter(data))
+        await resolve(putter(DATA_FINISH_MARKER))
 
     def configure(self, options):
         """Configures actor with provided options."""
@@ -196,6 +296,13 @@ class Sink:
         """
         return self.getter()
 
+    def receive_many(self, limit=CHUNK_SIZE):
+        """Get chunk of incoming data from input queue.
+
+        Helper method to be used in Actors to get incoming data in batches.
+        """
+        return receive_many(self.getter, limit)
+
 
 class Source:
     """Base class for Sources."""
@@ -209,6 +316,13 @@ class Source:
         """
         return self.putter(value)
 
+    def send_many(self, values):
+        """Send chunk of data to output queue.
+
+        Helper method to be used in Actors to send data in batches.
+        """
+        return send_many(self.putter, values)
+
 
 class Proc(Source, Sink):
     """Base class for Procs (both Sink and Source)."""
@@ -222,17 +336,28 @@ class Proc(Source, Sink):
             stub()
         )
 
+    def send_many(self, values, safe=False):
+        async def stub():
+            return None
+        return (
+            super().send_many(values)
+            if self.putter is not None or not safe else
+            stub()
+        )
+
 
 class Connector(Proc, Actor):
     """Connector class for actors.
 
     Main class implementing the libary idea of actors connection.
-    During startup it creates asyncio.Queue and connects it to legs.
+    During startup it flattens connected actors into linear pipeline,
+    creates channels between them and supervises them in single task.
     Also it implements magic to connect getter and putter to outside.
-    asyncio.Queue instantiated with maxsize=1.
-    If you need interim buffering between actors - you need to use
-    buffering actor between them otherwise left actor will be locked
-    if right one does not process data fast enough.
+    By default channel is asyncio.Queue instantiated with maxsize=1.
+    If you need interim buffering between actors - you need to increase
+    capacity or provide another channel type (see `aioflows.channels`)
+    otherwise left actor will be locked if right one does not process
+    data fast enough.
     """
 
     @dataclasses.dataclass
@@ -240,6 +365,11 @@ class Connector(Proc, Actor):
         left: Source
         right: Sink
         cancel: bool = False
+        capacity: Optional[int] = 1
+        '''Channel capacity, `None` makes channel unbounded.'''
+
+        channel: Callable[[int], asyncio.Queue] = asyncio.Queue
+        '''Channel type (asyncio.Queue compatible) instantiated on start.'''
 
     @property
     def putter(self):
@@ -272,34 +402,80 @@ class Connector(Proc, Actor):
         if options[left:]:
             self.config.right.configure(options[left:])
 
+    def plan(self):
+        """Flattens tree of connectors into linear pipeline plan.
+
+        Returns:
+            A tuple of leaf actors in flow order and list of joints.
+            Each joint is a tuple (connector, lo, mid, hi) where connector
+            joins actors[lo:mid] with actors[mid:hi] by the channel
+            between actors[mid - 1] and actors[mid].
+        """
+        actors, joints = [], []
+
+        def walk(actor):
+            if not isinstance(actor, Connector):
+                actors.append(actor)
+                return
+            lo = len(actors)
+            walk(actor.config.left)
+            mid = len(actors)
+            walk(actor.config.right)
+            joints.append((actor, lo, mid, len(actors)))
+
+        walk(self)
+        return actors, joints
+
     def start(self):
-        """Overrides main Actor flow to connect legs."""
-        queue = asyncio.Queue(1)
-        self.config.left.putter = queue.put
-        self.config.right.getter = queue.get
+        """Overrides main Actor flow to connect all actors of the flow.
+
+        Connector tree is compiled into flat list of actors connected
+        by channels, nested connectors are not started at all.
+        """
+        self.actors, self.joints = self.plan()
+        for connector, _, mid, _ in self.joints:
+            config = connector.config
+            queue = config.channel(config.capacity or 0)
+            self.actors[mid - 1].putter = queue.put
+            self.actors[mid].getter = queue.get
         return super().start()
 
     async def main(self):
-        """Overrides main Actor flow to await both legs."""
-        left = asyncio.ensure_future(self.config.left.start())
-        right = asyncio.ensure_future(self.config.right.start())
-        done, pending = await asyncio.wait(
-            (left, right),
-            return_when=asyncio.FIRST_COMPLETED,
-        )
-        if pending:
-            (done,), (pending,) = done, pending
-            if done.exception():
-                pending.cancel()
-            if self.config.cancel:
-                pending.cancel()
-            try:
-                await pending
-            except asyncio.CancelledError:
-                pass
-            done.result()
-        else:
-            [x.result() for x in done]
+        """Overrides main Actor flow to supervise all actors at once.
+
+        Exception in any actor cancels all others and is propagated.
+        Cancelling connection (`>=`) cancels one of its legs when another
+        one is finished. Cancellation of the flow cancels all actors.
+        """
+        tasks = []
+        started = {}
+        for actor in self.actors:
+            # actor could be used twice to make a loop (e.g. udp echo)
+            if id(actor) not in started:
+                started[id(actor)] = asyncio.ensure_future(actor.start())
+            tasks.append(started[id(actor)])
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    if not task.cancelled():
+                        task.result()
+                for connector, lo, mid, hi in self.joints:
+                    if not connector.config.cancel:
+                        continue
+                    left, right = tasks[lo:mid], tasks[mid:hi]
+                    if all(x.done() for x in right):
+                        [x.cancel() for x in left]
+                    elif all(x.done() for x in left):
+                        [x.cancel() for x in right]
+        finally:
+            if pending:
+                [x.cancel() for x in pending]
+                await asyncio.wait(pending)
 
     def __repr__(self):
         return f'{self.config.left} >> {self.config.right}'
@@ -0,0 +1,267 @@
+"""Opt-in runtime metrics of flows.
+
+Flow is instrumented by replacing channels of its edges with metered
+ones, so not instrumented flows have no overhead at all.
+"""
+import asyncio
+import dataclasses
+import time
+from typing import Optional
+
+from .channels import ChannelMixinError, mixed_with
+from .core import DATA_FINISH_MARKER, Actor, Source
+
+
+@dataclasses.dataclass
+class Processing:
+    """Processing time of actor.
+
+    Measured from return of get from incoming channel of actor to its
+    next get or put, so blocking on channels is not included but waits
+    of actor itself while it processes event (e.g. executor or network)
+    are. Sources receive no events and have no processing time.
+    """
+
+    total: float = 0
+    received: Optional[float] = None
+    '''Time last event was received (if it is still processed).'''
+
+    def enter(self):
+        """Stops processing on channel operation."""
+        if self.received is not None:
+            self.total += time.perf_counter() - self.received
+            self.received = None
+
+    def leave(self, item):
+        """Starts processing of received item."""
+        if item is not DATA_FINISH_MARKER:
+            self.received = time.perf_counter()
+
+    def current(self, now):
+        if self.received is None:
+            return self.total
+        return self.total + now - self.received
+
+
+@dataclasses.dataclass
+class Edge:
+    """Metrics of channel between two actors."""
+
+    events: int = 0
+    depth_max: int = 0
+    put_wait: float = 0
+    '''Total time producer was blocked in put.'''
+
+    get_wait: float = 0
+    '''Total time consumer was blocked in get.'''
+
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    channel: asyncio.Queue = None
+    producer: Processing = dataclasses.field(default_factory=Processing)
+    consumer: Processing = dataclasses.field(default_factory=Processing)
+
+
+class Metered:
+    """Channel mixin recording metrics of edge."""
+
+    edge: Edge = None
+
+    def put_nowait(self, item):
+        self.edge.producer.enter()
+        super().put_nowait(item)
+        edge = self.edge
+        if item is DATA_FINISH_MARKER:
+            edge.finished = time.perf_counter()
+            return
+        edge.events += 1
+        depth = self.qsize()
+        if depth > edge.depth_max:
+            edge.depth_max = depth
+
+    async def put(self, item):
+        self.edge.producer.enter()
+        if not self.full():
+            return await super().put(item)
+        started = time.perf_counter()
+        try:
+            return await super().put(item)
+        finally:
+            self.edge.put_wait += time.perf_counter() - started
+
+    def get_nowait(self):
+        self.edge.consumer.enter()
+        item = super().get_nowait()
+        self.edge.consumer.leave(item)
+        return item
+
+    async def get(self):
+        consumer = self.edge.consumer
+        consumer.enter()
+        if not self.empty():
+            item = await super().get()
+        else:
+            started = time.perf_counter()
+            try:
+                item = await super().get()
+            finally:
+                self.edge.get_wait += time.perf_counter() - started
+        consumer.leave(item)
+        return item
+
+
+METERED_CHANNELS = {}
+
+
+def metered(channel, edge):
+    """Returns channel factory producing metered channels of edge."""
+    def factory(capacity):
+        queue = channel(capacity)
+        cls = type(queue)
+        if cls not in METERED_CHANNELS:
+            METERED_CHANNELS[cls] = type(cls.__name__, (Metered, cls), {})
+        queue.__class__ = METERED_CHANNELS[cls]
+        queue.edge = edge
+        edge.channel = queue
+        edge.started = time.perf_counter()
+        return queue
+    factory.mixin = Metered
+    factory.wrapped = channel
+    return factory
+
+
+class Metrics:
+    """Registry of edges and actors metrics of instrumented flows.
+
+    Actor processing time is measured by its incoming and outgoing
+    channels (see Processing).
+    """
+
+    def __init__(self):
+        self.edges = {}
+        self.actors = {}
+
+    def instrument(self, flow):
+        """Replaces channels of flow edges with metered ones.
+
+        Raises:
+            ChannelMixinError: if flow is already instrumented.
+        """
+        actors, joints = flow.plan()
+        for connector, *_ in joints:
+            if mixed_with(connector.config.channel, Metered):
+                raise ChannelMixinError(Metered)
+        names = [f'{actor!r}[{index}]' for index, actor in enumerate(actors)]
+        processing = [Processing() for _ in actors]
+        edges = {}
+        for connector, _, mid, _ in joints:
+            edge = edges[mid] = Edge(
+                producer=processing[mid - 1],
+                consumer=processing[mid],
+            )
+            self.edges[f'{names[mid - 1]} >> {names[mid]}'] = edge
+            connector.config.channel = metered(connector.config.channel, edge)
+        for index, name in enumerate(names):
+            self.actors[name] = (
+                edges.get(index),
+                edges.get(index + 1),
+                processing[index],
+            )
+        return flow
+
+    @staticmethod
+    def elapsed(edge, now):
+        if edge is None or edge.started is None:
+            return 0
+        return (edge.finished or now) - edge.started
+
+    def snapshot(self):
+        """Returns dict of current metrics."""
+        now = time.perf_counter()
+        edges = {}
+        for name, edge in self.edges.items():
+            elapsed = self.elapsed(edge, now)
+            edges[name] = {
+                'events': edge.events,
+                'rate': edge.events / elapsed if elapsed else 0,
+                'depth': edge.channel.qsize() if edge.channel else 0,
+                'depth_max': edge.depth_max,
+                'put_wait': edge.put_wait,
+                'get_wait': edge.get_wait,
+            }
+        actors = {}
+        for name, (incoming, outgoing, processing) in self.actors.items():
+            events = (incoming or outgoing).events
+            total = processing.current(now)
+            actors[name] = {
+                'events': events,
+                'processing': total,
+                'per_event': total / events if incoming and events else 0,
+            }
+        return {'edges': edges, 'actors': actors}
+
+
+def instrument(flow, metrics=None):
+    """Instruments flow and returns its metrics."""
+    metrics = metrics or Metrics()
+    metrics.instrument(flow)
+    return metrics
+
+
+PROMETHEUS_METRICS = (
+    ('edges', 'edge', 'events', 'aioflows_edge_events_total', 'counter'),
+    ('edges', 'edge', 'depth', 'aioflows_edge_depth', 'gauge'),
+    ('edges', 'edge', 'depth_max', 'aioflows_edge_depth_max', 'gauge'),
+    (
+        'edges',
+        'edge',
+        'put_wait',
+        'aioflows_edge_put_wait_seconds_total',
+        'counter',
+    ),
+    (
+        'edges',
+        'edge',
+        'get_wait',
+        'aioflows_edge_get_wait_seconds_total',
+        'counter',
+    ),
+    ('actors', 'actor', 'events', 'aioflows_actor_events_total', 'counter'),
+    (
+        'actors',
+        'actor',
+        'processing',
+        'aioflows_actor_processing_seconds_total',
+        'counter',
+    ),
+)
+
+
+def prometheus(snapshot):
+    """Formats metrics snapshot in Prometheus text format."""
+    lines = []
+    for group, label, key, name, kind in PROMETHEUS_METRICS:
+        lines.append(f'# TYPE {name} {kind}')
+        for item, values in snapshot[group].items():
+            item = item.replace('\\', '\\\\').replace('"', '\\"')
+            lines.append(f'{name}{{{label}="{item}"}} {values[key]}')
+    return '\n'.join(lines) + '\n'
+
+
+class Exporter(Source, Actor):
+    """Source actor periodically sending metrics in Prometheus format."""
+
+    @dataclasses.dataclass
+    class Options:
+        interval: float = 1
+        '''Interval between reports in seconds.'''
+
+    @dataclasses.dataclass
+    class Arguments(Options):
+        metrics: Metrics = None
+        '''Metrics to be exported.'''
+
+    async def main(self):
+        while True:
+            await self.send(prometheus(self.config.metrics.snapshot()))
+            await asyncio.sleep(self.config.interval)
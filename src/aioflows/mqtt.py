@@ -1,8 +1,19 @@
+import asyncio
 import dataclasses
+from typing import Optional
 
 import aiomqtt
 
-from aioflows.core import Actor, Source
+from aioflows.core import (
+    CHUNK_SIZE,
+    DATA_FINISH_MARKER,
+    Actor,
+    ActorOptionValueError,
+    Sink,
+    Source,
+    receiver,
+)
+from aioflows.simple import TEE_POLICIES, Branch
 
 
 class Subscriber(Source, Actor):
@@ -22,3 +33,213 @@ class Subscriber(Source, Actor):
             async for message in messages:
                 if message.topic.matches(self.config.topic):
                     await self.send(message)
+
+
+class TopicTrie:
+    """Trie of MQTT topic filters supporting `+` and `#` wildcards."""
+
+    def __init__(self):
+        self.children = {}
+        self.values = []
+
+    def insert(self, topic, value):
+        node = self
+        for level in topic.split('/'):
+            node = node.children.setdefault(level, TopicTrie())
+        node.values.append(value)
+
+    def match(self, topic):
+        """Returns values of all filters matching topic."""
+        result = []
+        nodes = [self]
+        for index, level in enumerate(topic.split('/')):
+            # wildcards do not match topics starting with `$`
+            wildcards = index or not level.startswith('$')
+            matched = []
+            for node in nodes:
+                if wildcards:
+                    if '#' in node.children:
+                        result.extend(node.children['#'].values)
+                    if '+' in node.children:
+                        matched.append(node.children['+'])
+                if level in node.children:
+                    matched.append(node.children[level])
+            nodes = matched
+        for node in nodes:
+            result.extend(node.values)
+            # `a/#` matches `a` too
+            if '#' in node.children:
+                result.extend(node.children['#'].values)
+        return result
+
+
+class TopicRouter(Source, Actor):
+    """Source actor dispatching client messages to branches by topic.
+
+    Each message is matched once against trie of topic filters and sent
+    to every matching branch. Each branch has its own channel (as in
+    Tee) with `sample` policy by default, so slow branch never blocks
+    others and gets latest messages. Branches with `block` policy are
+    not isolated: dispatch to all branches waits for free space in
+    their channels. Messages not matching any filter are sent to main
+    flow.
+    """
+
+    @dataclasses.dataclass
+    class Options:
+        capacity: Optional[int] = 1
+        '''Default capacity of branches channels.'''
+
+        policy: str = 'sample'
+        '''Default overflow policy of branches (see Tee).'''
+
+        subscribe: bool = True
+        '''Subscribe client to topic filters of routes.'''
+
+    @dataclasses.dataclass
+    class Arguments(Options):
+        client: aiomqtt.Client = None
+        '''Client connection to broker.'''
+
+        routes: dict = None
+        '''Mapping of topic filters to sinks (or Branches).'''
+
+    queues: list = None
+    trie: TopicTrie = None
+
+    @property
+    def branches(self):
+        return {
+            topic: sink if isinstance(sink, Branch) else Branch(
+                sink=sink,
+                capacity=self.config.capacity,
+                policy=self.config.policy,
+            )
+            for topic, sink in (self.config.routes or {}).items()
+        }
+
+    async def main(self):
+        client = self.config.client
+        async with client.messages() as messages:
+            if self.config.subscribe:
+                for topic in self.config.routes or {}:
+                    await client.subscribe(topic)
+            async for message in messages:
+                queues = self.trie.match(message.topic.value)
+                if not queues and self.putter is not None:
+                    await self.send(message)
+                for queue in queues:
+                    await queue.put(message)
+        if self.putter is not None:
+            await self.send(DATA_FINISH_MARKER)
+        for queue in self.queues:
+            await queue.put(DATA_FINISH_MARKER)
+
+    def start(self):
+        self.queues = []
+        self.trie = TopicTrie()
+        branches = self.branches
+        for topic, branch in branches.items():
+            if branch.policy not in TEE_POLICIES:
+                raise ActorOptionValueError('policy', branch.policy)
+            queue = TEE_POLICIES[branch.policy](branch.capacity or 0)
+            branch.sink.getter = queue.get
+            self.queues.append(queue)
+            self.trie.insert(topic, queue)
+        return asyncio.gather(
+            *(branch.sink.start() for branch in branches.values()),
+            super().start(),
+        )
+
+
+class Publisher(Sink, Actor):
+    """Sink actor publishing events to broker.
+
+    Events are payloads to be published to `topic` or `(topic, payload)`
+    pairs. Publishes are pipelined: up to `inflight` of them wait for
+    broker acknowledgement concurrently and receiving of new events is
+    blocked while all of them are in flight.
+    """
+
+    @dataclasses.dataclass
+    class Options:
+        topic: Optional[str] = None
+        '''Topic of messages, if not set events are (topic, payload).'''
+
+        qos: int = 0
+        '''Quality of service level of messages.'''
+
+        retain: bool = False
+        '''Publish retained messages.'''
+
+        inflight: int = 16
+        '''Maximum number of publishes waiting for acknowledgement.'''
+
+        coalesce: Optional[int] = None
+        '''Maximum size of payload grouped from consecutive payloads.
+
+        Payloads of the same topic available at once are joined with
+        separator while result fits into the size.
+        '''
+
+        separator: bytes = b'\n'
+        '''Separator of grouped payloads.'''
+
+    @dataclasses.dataclass
+    class Arguments(Options):
+        client: aiomqtt.Client = None
+        '''Client connection to broker.'''
+
+    def messages(self, chunk):
+        topic = self.config.topic
+        if topic is not None:
+            chunk = [(topic, payload) for payload in chunk]
+        if not self.config.coalesce:
+            return chunk
+        limit, separator = self.config.coalesce, self.config.separator
+        result = []
+        for topic, payload in chunk:
+            if (
+                result
+                and result[-1][0] == topic
+                and len(result[-1][1]) + len(separator) + len(payload) <= limit
+            ):
+                result[-1][1].extend(separator)
+                result[-1][1].extend(payload)
+            else:
+                result.append((topic, bytearray(payload)))
+        return result
+
+    async def main(self):
+        window = asyncio.Semaphore(self.config.inflight)
+        tasks = set()
+        failed = []
+
+        def done(task):
+            tasks.discard(task)
+            window.release()
+            if not task.cancelled() and task.exception() is not None:
+                failed.append(task)
+
+        try:
+            async for chunk in receiver(self.receive, chunk=CHUNK_SIZE):
+                for topic, payload in self.messages(chunk):
+                    await window.acquire()
+                    if failed:
+                        failed[0].result()
+                    task = asyncio.ensure_future(self.config.client.publish(
+                        topic,
+                        payload,
+                        qos=self.config.qos,
+                        retain=self.config.retain,
+                    ))
+                    tasks.add(task)
+                    task.add_done_callback(done)
+            # wait for all publishes to be acknowledged
+            for _ in range(self.config.inflight):
+                await window.acquire()
+            if failed:
+                failed[0].result()
+        finally:
+            for task in tasks:
+                task.cancel()
@@ -1,49 +1,744 @@
 import asyncio
 import dataclasses
-from typing import Any, Dict
+import functools
+import socket
+import struct
+from typing import Any, Callable, Dict, Optional
 
-from .core import Actor, Proc
+from .core import (
+    CHUNK_SIZE,
+    DATA_FINISH_MARKER,
+    Actor,
+    Proc,
+    Source,
+    receiver,
+    resolve,
+)
+
+
+class BufferPool:
+    """Pool of receive buffers.
+
+    Buffer is reused only after all memoryviews of it are released
+    (bytearray with exported views can not be resized).
+    """
+
+    def __init__(self, size, limit=4):
+        self.size = size
+        self.limit = limit
+        self.buffers = []
+
+    @staticmethod
+    def released(buffer):
+        try:
+            buffer.append(0)
+        except BufferError:
+            return False
+        del buffer[-1]
+        return True
+
+    def acquire(self):
+        for buffer in self.buffers:
+            if self.released(buffer):
+                return buffer
+        buffer = bytearray(self.size)
+        if len(self.buffers) < self.limit:
+            self.buffers.append(buffer)
+        return buffer
+
+
+def bind(
+    local_addr=None,
+    remote_addr=None,
+    *,
+    family=0,
+    proto=0,
+    reuse_port=None,
+    allow_broadcast=None,
+    sock=None,
+):
+    """Creates non-blocking datagram socket.
+
+    Accepts subset of `create_datagram_endpoint` arguments.
+    """
+    if sock is None:
+        addr = local_addr or remote_addr
+        if not family and addr is not None:
+            family = socket.getaddrinfo(
+                *addr,
+                type=socket.SOCK_DGRAM,
+            )[0][0]
+        sock = socket.socket(family or socket.AF_INET, socket.SOCK_DGRAM, proto)
+        if reuse_port:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        if allow_broadcast:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        if local_addr is not None:
+            sock.bind(local_addr)
+        if remote_addr is not None:
+            sock.connect(remote_addr)
+    sock.setblocking(False)
+    return sock
 
 
 class Udp(Proc, Actor):
+    """Udp socket actor.
+
+    Sends received datagrams as `(data, addr)` events and sends incoming
+    `(data, addr)` events (or lists of them) to network. Datagrams
+    received while buffer is full are dropped and counted in `dropped`.
+    Sending is paused while transport write buffer is above high water
+    mark until it is drained below low water mark.
+
+    In bulk mode datagrams are read from non-blocking socket in batches
+    (up to `bulk` datagrams per loop iteration) into pooled buffers and
+    sent as lists of `(memoryview, addr)` events. Views keep their buffer
+    from being reused, so they should be released (or copied with bytes)
+    as soon as possible.
+    """
+
     queue: asyncio.Queue = None
+    closed: asyncio.Future = None
+    writable: asyncio.Event = None
+    dropped: int = 0
 
     @dataclasses.dataclass
     class Options:
         options: Dict[str, Any] = None
         '''Socket options sended directly to `create_datagram_endpoint`.'''
 
+        capacity: Optional[int] = 1
+        '''Capacity of received datagrams (batches) buffer.'''
+
+        bulk: Optional[int] = None
+        '''Maximum number of datagrams read at once in bulk mode.'''
+
+        size: int = 2048
+        '''Maximum size of datagram in bulk mode.'''
+
+        high: Optional[int] = None
+        '''High water mark of transport write buffer.'''
+
+        low: Optional[int] = None
+        '''Low water mark of transport write buffer.'''
+
+        coalesce: Optional[int] = None
+        '''Maximum size of datagram coalesced from consecutive events.
+
+        Available events to the same address are joined with separator.
+        '''
+
+        separator: bytes = b'\n'
+        '''Separator of coalesced events.'''
+
     def connection_made(self, transport):
         pass
 
     def connection_lost(self, exc):
-        self.main.cancel()
+        if self.closed is not None and not self.closed.done():
+            self.closed.set_result(exc)
+
+    def pause_writing(self):
+        self.writable.clear()
+
+    def resume_writing(self):
+        self.writable.set()
 
     def datagram_received(self, data, addr):
-        self.queue.put_nowait((data, addr))
+        if self.queue.full():
+            self.dropped += 1
+        else:
+            self.queue.put_nowait((data, addr))
+
+    def read_ready(self, sock, pool):
+        bulk, size = self.config.bulk, self.config.size
+        buffer = pool.acquire()
+        view = memoryview(buffer)
+        batch = []
+        for offset in range(0, bulk * size, size):
+            try:
+                nbytes, addr = sock.recvfrom_into(view[offset:offset + size])
+            except (BlockingIOError, InterruptedError):
+                break
+            except ConnectionRefusedError:
+                continue
+            batch.append((view[offset:offset + nbytes], addr))
+        view.release()
+        if not batch:
+            return
+        if self.queue.full():
+            self.dropped += len(batch)
+        else:
+            self.queue.put_nowait(batch)
+
+    async def sendto(self, sock, data, addr):
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                return sock.sendto(data, addr)
+            except (BlockingIOError, InterruptedError):
+                writable = loop.create_future()
+                loop.add_writer(sock.fileno(), writable.set_result, None)
+                try:
+                    await writable
+                finally:
+                    loop.remove_writer(sock.fileno())
+
+    def coalesce(self, datagrams):
+        limit, separator = self.config.coalesce, self.config.separator
+        result = []
+        for data, addr in datagrams:
+            if (
+                result
+                and result[-1][1] == addr
+                and len(result[-1][0]) + len(separator) + len(data) <= limit
+            ):
+                result[-1][0].extend(separator)
+                result[-1][0].extend(data)
+            else:
+                result.append((bytearray(data), addr))
+        return result
+
+    async def egress(self, sendto):
+        async for chunk in receiver(self.receive, chunk=CHUNK_SIZE):
+            datagrams = [
+                datagram
+                for event in chunk
+                for datagram in (event if isinstance(event, list) else (event,))
+            ]
+            if self.config.coalesce:
+                datagrams = self.coalesce(datagrams)
+            for data, addr in datagrams:
+                if not self.writable.is_set():
+                    await self.writable.wait()
+                await resolve(sendto(data, addr))
+
+    async def transfer(self, sendto):
+        tasks = []
+        if self.getter is not None:
+            tasks.append(self.egress(sendto))
+        if self.putter is not None:
+            tasks.append(self.mover(
+                self.queue.get,
+                self.send,
+            ))
+        await asyncio.gather(*tasks)
 
     async def main(self):
         loop = asyncio.get_running_loop()
-        transport, _ = await loop.create_datagram_endpoint(
-            lambda: self,
-            **self.config.options,
+        self.closed = loop.create_future()
+        options = self.config.options or {}
+        if self.config.bulk:
+            sock = bind(**options)
+            pool = BufferPool(self.config.bulk * self.config.size)
+            if self.putter is not None:
+                loop.add_reader(sock.fileno(), self.read_ready, sock, pool)
+            sendto = functools.partial(self.sendto, sock)
+            close = sock.close
+        else:
+            transport, _ = await loop.create_datagram_endpoint(
+                lambda: self,
+                **options,
+            )
+            transport.set_write_buffer_limits(self.config.high, self.config.low)
+            sendto = transport.sendto
+            close = transport.close
+        movers = asyncio.ensure_future(self.transfer(sendto))
+        try:
+            await asyncio.wait(
+                (movers, self.closed),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if movers.done():
+                movers.result()
+            elif self.closed.result() is not None:
+                raise self.closed.result()
+        finally:
+            movers.cancel()
+            await asyncio.wait((movers,))
+            if self.config.bulk:
+                loop.remove_reader(sock.fileno())
+            close()
+
+    def start(self):
+        self.closed = None
+        self.writable = asyncio.Event()
+        self.writable.set()
+        self.queue = asyncio.Queue(maxsize=self.config.capacity or 0)
+        return super().start()
+
+
+@dataclasses.dataclass
+class LineFraming:
+    """Frames separated by delimiter (newline by default)."""
+
+    separator: bytes = b'\n'
+    '''Frames separator (not included into frames).'''
+
+    async def read(self, reader):
+        """Reads next frame from stream, returns None on EOF."""
+        try:
+            frame = await reader.readuntil(self.separator)
+        except asyncio.IncompleteReadError as exc:
+            return exc.partial or None
+        return frame[:-len(self.separator)]
+
+    def locate(self, buffer, start, end):
+        """Returns `(begin, stop, next)` of frame in buffer or None."""
+        stop = buffer.find(self.separator, start, end)
+        if stop < 0:
+            return None
+        return start, stop, stop + len(self.separator)
+
+    def tail(self, data):
+        """Returns frame of incomplete data at EOF."""
+        return data
+
+    def write(self, writer, data):
+        writer.writelines((data, self.separator))
+
+
+@dataclasses.dataclass
+class LengthFraming:
+    """Frames prefixed with their length."""
+
+    header: str = '!I'
+    '''Struct format of length prefix.'''
+
+    async def read(self, reader):
+        """Reads next frame from stream, returns None on EOF."""
+        header = struct.Struct(self.header)
+        try:
+            size, = header.unpack(await reader.readexactly(header.size))
+        except asyncio.IncompleteReadError as exc:
+            if exc.partial:
+                raise
+            return None
+        return await reader.readexactly(size)
+
+    def locate(self, buffer, start, end):
+        """Returns `(begin, stop, next)` of frame in buffer or None."""
+        header = struct.Struct(self.header)
+        if end - start < header.size:
+            return None
+        size, = header.unpack_from(buffer, start)
+        begin = start + header.size
+        if end - begin < size:
+            return None
+        return begin, begin + size, begin + size
+
+    def tail(self, data):
+        """Returns frame of incomplete data at EOF."""
+        raise asyncio.IncompleteReadError(bytes(data), None)
+
+    def write(self, writer, data):
+        writer.writelines((struct.pack(self.header, len(data)), data))
+
+
+@dataclasses.dataclass
+class FixedFraming:
+    """Frames of fixed size."""
+
+    size: int = 1
+    '''Size of frame.'''
+
+    async def read(self, reader):
+        """Reads next frame from stream, returns None on EOF."""
+        try:
+            return await reader.readexactly(self.size)
+        except asyncio.IncompleteReadError as exc:
+            if exc.partial:
+                raise
+            return None
+
+    def locate(self, buffer, start, end):
+        """Returns `(begin, stop, next)` of frame in buffer or None."""
+        if end - start < self.size:
+            return None
+        return start, start + self.size, start + self.size
+
+    def tail(self, data):
+        """Returns frame of incomplete data at EOF."""
+        raise asyncio.IncompleteReadError(bytes(data), self.size)
+
+    def write(self, writer, data):
+        if len(data) != self.size:
+            raise ValueError(f'frame size {len(data)} != {self.size}')
+        writer.write(data)
+
+
+class Stream:
+    """Framed stream connection to be used as actors getter and putter."""
+
+    def __init__(self, reader, writer, framing):
+        self.reader = reader
+        self.writer = writer
+        self.framing = framing
+
+    @property
+    def peer(self):
+        return self.writer.get_extra_info('peername')
+
+    async def get(self):
+        frame = await self.framing.read(self.reader)
+        return DATA_FINISH_MARKER if frame is None else frame
+
+    async def put(self, data):
+        if data is DATA_FINISH_MARKER:
+            if self.writer.can_write_eof():
+                self.writer.write_eof()
+            return
+        self.framing.write(self.writer, data)
+        await self.writer.drain()
+
+    async def close(self):
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+class BufferedStream(asyncio.BufferedProtocol):
+    """Framed stream connection reading directly into pooled buffers.
+
+    Frames are sent as memoryviews of buffers without copying. Only tail
+    of incomplete frame is moved to another buffer when current one is
+    full. Reading is paused while `size` bytes are buffered and nobody
+    waits for a frame.
+    """
+
+    def __init__(self, framing, size, connected=None):
+        self.framing = framing
+        self.pool = BufferPool(size)
+        self.buffer = self.pool.acquire()
+        self.start = self.end = 0
+        self.connected = connected
+        self.transport = None
+        self.paused = False
+        self.eof = False
+        self.error = None
+        self.waiter = None
+        self.writable = asyncio.Event()
+        self.writable.set()
+        self.closed = asyncio.get_running_loop().create_future()
+
+    @property
+    def peer(self):
+        return self.transport.get_extra_info('peername')
+
+    def wakeup(self):
+        if self.waiter is not None and not self.waiter.done():
+            self.waiter.set_result(None)
+
+    def connection_made(self, transport):
+        self.transport = transport
+        if self.connected is not None:
+            asyncio.ensure_future(self.connected(self))
+
+    def connection_lost(self, exc):
+        self.eof = True
+        self.error = exc
+        self.writable.set()
+        self.wakeup()
+        if not self.closed.done():
+            self.closed.set_result(exc)
+
+    def pause_writing(self):
+        self.writable.clear()
+
+    def resume_writing(self):
+        self.writable.set()
+
+    def eof_received(self):
+        self.eof = True
+        self.wakeup()
+        # keep transport open for writing
+        return True
+
+    def get_buffer(self, sizehint):
+        if len(self.buffer) - self.end < self.pool.size // 4:
+            self.compact()
+        return memoryview(self.buffer)[self.end:]
+
+    def buffer_updated(self, nbytes):
+        self.end += nbytes
+        if self.waiter is not None:
+            self.wakeup()
+        elif not self.paused and self.end - self.start >= self.pool.size:
+            self.transport.pause_reading()
+            self.paused = True
+
+    def compact(self):
+        """Moves tail of incomplete frame to the start of free buffer."""
+        pending = self.end - self.start
+        if pending * 2 > self.pool.size:
+            # frame does not fit into pooled buffer
+            buffer = bytearray(pending * 2)
+        else:
+            buffer = self.pool.acquire()
+        buffer[:pending] = self.buffer[self.start:self.end]
+        self.buffer, self.start, self.end = buffer, 0, pending
+
+    async def get(self):
+        while True:
+            bounds = self.framing.locate(self.buffer, self.start, self.end)
+            if bounds is not None:
+                begin, stop, self.start = bounds
+                return memoryview(self.buffer)[begin:stop]
+            if self.eof:
+                if self.start == self.end:
+                    if self.error is not None:
+                        raise self.error
+                    return DATA_FINISH_MARKER
+                data = memoryview(self.buffer)[self.start:self.end]
+                self.start = self.end
+                return self.framing.tail(data)
+            if self.paused:
+                self.transport.resume_reading()
+                self.paused = False
+            self.waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self.waiter
+            finally:
+                self.waiter = None
+
+    async def put(self, data):
+        if data is DATA_FINISH_MARKER:
+            if self.transport.can_write_eof():
+                self.transport.write_eof()
+            return
+        if self.closed.done():
+            raise ConnectionResetError('connection lost')
+        self.framing.write(self.transport, data)
+        if not self.writable.is_set():
+            await self.writable.wait()
+
+    async def close(self):
+        self.transport.close()
+        await self.closed
+
+
+class TcpClient(Proc, Actor):
+    """Tcp client actor.
+
+    Sends received frames as events and sends incoming events as frames.
+    """
+
+    @dataclasses.dataclass
+    class Options:
+        host: Optional[str] = None
+        '''Host to connect to.'''
+
+        port: Optional[int] = None
+        '''Port to connect to.'''
+
+    @dataclasses.dataclass
+    class Arguments(Options):
+        framing: Any = dataclasses.field(default_factory=LineFraming)
+        '''Framing of stream (line, length prefixed or fixed size).'''
+
+        options: Dict[str, Any] = None
+        '''Options sended directly to `open_connection`.
+
+        In buffered mode they are sended to `create_connection`.
+        '''
+
+        buffer: Optional[int] = None
+        '''Size of pooled receive buffers, enables buffered mode.
+
+        Stream is read directly into buffers and frames are sent as
+        memoryviews of them. Views keep their buffer from being reused,
+        so they should be released (or copied with bytes) as soon as
+        possible.
+        '''
+
+    def open_connection(self):
+        return asyncio.open_connection(
+            self.config.host,
+            self.config.port,
+            **(self.config.options or {}),
         )
+
+    def create_connection(self, factory):
+        return asyncio.get_running_loop().create_connection(
+            factory,
+            self.config.host,
+            self.config.port,
+            **(self.config.options or {}),
+        )
+
+    async def main(self):
+        if self.config.buffer:
+            _, stream = await self.create_connection(
+                lambda: BufferedStream(self.config.framing, self.config.buffer),
+            )
+        else:
+            reader, writer = await self.open_connection()
+            stream = Stream(reader, writer, self.config.framing)
         try:
             tasks = []
             if self.getter is not None:
-                tasks.append(self.mover(
-                    self.receive,
-                    lambda x: transport.sendto(*x),
-                ))
+                tasks.append(self.mover(self.receive, stream.put))
             if self.putter is not None:
-                tasks.append(self.mover(
-                    self.queue.get,
-                    self.send,
-                ))
+                tasks.append(self.mover(stream.get, self.send))
             await asyncio.gather(*tasks)
         finally:
-            transport.close()
+            await stream.close()
 
-    def start(self):
-        self.queue = asyncio.Queue(maxsize=1)
-        return super().start()
+
+class UnixClient(TcpClient):
+    """Unix socket client actor."""
+
+    @dataclasses.dataclass
+    class Options:
+        path: Optional[str] = None
+        '''Path of unix socket.'''
+
+    @dataclasses.dataclass
+    class Arguments(Options, TcpClient.Arguments):
+        pass
+
+    def open_connection(self):
+        return asyncio.open_unix_connection(
+            self.config.path,
+            **(self.config.options or {}),
+        )
+
+    def create_connection(self, factory):
+        return asyncio.get_running_loop().create_unix_connection(
+            factory,
+            self.config.path,
+            **(self.config.options or {}),
+        )
+
+
+class TcpServer(Source, Actor):
+    """Tcp server actor.
+
+    Each connection is served by its own flow created by handler. The
+    flow receives frames of connection as events and its events are sent
+    back as frames. Without handler frames of all connections are sent
+    as `(frame, peername)` events.
+    """
+
+    @dataclasses.dataclass
+    class Options:
+        host: Optional[str] = None
+        '''Host to listen on.'''
+
+        port: Optional[int] = None
+        '''Port to listen on.'''
+
+        max_connections: Optional[int] = None
+        '''Maximum number of connections, extra ones are closed.'''
+
+    @dataclasses.dataclass
+    class Arguments(Options):
+        handler: Callable[[], Actor] = None
+        '''Function creating flow for connection.'''
+
+        framing: Any = dataclasses.field(default_factory=LineFraming)
+        '''Framing of streams (line, length prefixed or fixed size).'''
+
+        options: Dict[str, Any] = None
+        '''Options sended directly to `start_server`.
+
+        In buffered mode they are sended to `create_server`.
+        '''
+
+        buffer: Optional[int] = None
+        '''Size of pooled receive buffers of connection (see TcpClient).'''
+
+    server: asyncio.AbstractServer = None
+    connections: set = None
+
+    def serve(self, callback):
+        return asyncio.start_server(
+            callback,
+            self.config.host,
+            self.config.port,
+            **(self.config.options or {}),
+        )
+
+    def create_server(self, factory):
+        return asyncio.get_running_loop().create_server(
+            factory,
+            self.config.host,
+            self.config.port,
+            **(self.config.options or {}),
+        )
+
+    async def handle(self, stream):
+        limit = self.config.max_connections
+        if limit is not None and len(self.connections) >= limit:
+            await stream.close()
+            return
+        task = asyncio.current_task()
+        self.connections.add(task)
+        try:
+            if self.config.handler is None:
+                peer = stream.peer
+                async for frame in receiver(stream.get):
+                    await self.send((frame, peer))
+            else:
+                flow = self.config.handler()
+                flow.getter = stream.get
+                flow.putter = stream.put
+                await flow.start()
+        finally:
+            self.connections.discard(task)
+            await stream.close()
+
+    async def main(self):
+        self.connections = set()
+        if self.config.buffer:
+            self.server = await self.create_server(
+                lambda: BufferedStream(
+                    self.config.framing,
+                    self.config.buffer,
+                    connected=self.handle,
+                ),
+            )
+        else:
+            self.server = await self.serve(
+                lambda reader, writer: self.handle(
+                    Stream(reader, writer, self.config.framing),
+                ),
+            )
+        try:
+            async with self.server:
+                await self.server.serve_forever()
+        finally:
+            for task in self.connections:
+                task.cancel()
+
+
+class UnixServer(TcpServer):
+    """Unix socket server actor."""
+
+    @dataclasses.dataclass
+    class Options:
+        path: Optional[str] = None
+        '''Path of unix socket.'''
+
+        max_connections: Optional[int] = None
+        '''Maximum number of connections, extra ones are closed.'''
+
+    @dataclasses.dataclass
+    class Arguments(Options, TcpServer.Arguments):
+        pass
+
+    def serve(self, callback):
+        return asyncio.start_unix_server(
+            callback,
+            self.config.path,
+            **(self.config.options or {}),
+        )
+
+    def create_server(self, factory):
+        return asyncio.get_running_loop().create_unix_server(
+            factory,
+            self.config.path,
+            **(self.config.options or {}),
+        )
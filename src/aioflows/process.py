@@ -0,0 +1,395 @@
+import asyncio
+import collections
+import dataclasses
+import multiprocessing
+import threading
+import traceback
+from multiprocessing import shared_memory
+from typing import Any, Callable, NamedTuple, Optional
+
+from aioflows.core import CHUNK_SIZE, DATA_FINISH_MARKER, Actor, Proc, receiver
+from aioflows.thread import Channel
+
+
+class ProcessWorkerError(RuntimeError):
+    def __init__(self, reason):
+        super().__init__(
+            f'process worker failed: {reason}',
+        )
+
+
+def spawn(func, *args, name=None):
+    """Runs function in dedicated thread, returns future of its result.
+
+    Transport loops block for the whole actor lifetime, so they do not
+    occupy threads of the shared default executor.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def done(result, error):
+        if future.cancelled():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def target():
+        result, error = None, None
+        try:
+            result = func(*args)
+        except BaseException as exc:
+            error = exc
+        try:
+            loop.call_soon_threadsafe(done, result, error)
+        except RuntimeError:
+            # event loop is already closed
+            pass
+
+    threading.Thread(target=target, name=name, daemon=True).start()
+    return future
+
+
+class Failure(NamedTuple):
+    """Exception raised by worker function."""
+
+    traceback: str
+
+
+class Slot(NamedTuple):
+    """Reference to bytes payload stored in shared memory ring."""
+
+    index: int
+    size: int
+
+
+class Ring:
+    """Ring of fixed size shared memory slots for bytes payloads.
+
+    Slots are written and released in the same order by the only writer
+    and the only reader, so free slots are just counted with semaphore.
+    """
+
+    def __init__(self, context, slots, size):
+        self.memory = shared_memory.SharedMemory(create=True, size=slots * size)
+        self.free = context.Semaphore(slots)
+        self.slots = slots
+        self.size = size
+        self.head = 0
+        self.closed = False
+
+    def __getstate__(self):
+        return self.memory, self.free, self.slots, self.size
+
+    def __setstate__(self, state):
+        self.memory, self.free, self.slots, self.size = state
+        self.head = 0
+        self.closed = False
+
+    def fits(self, value):
+        return (
+            isinstance(value, (bytes, bytearray, memoryview))
+            and memoryview(value).nbytes <= self.size
+        )
+
+    def acquire(self, block=True):
+        if not block:
+            return self.free.acquire(False)
+        while not self.free.acquire(timeout=0.1):
+            if self.closed:
+                raise RuntimeError('ring is closed')
+        return True
+
+    def release(self, count=1):
+        for _ in range(count):
+            self.free.release()
+
+    def write(self, value):
+        index = self.head
+        self.head = (index + 1) % self.slots
+        view = memoryview(value).cast('B')
+        offset = index * self.size
+        self.memory.buf[offset:offset + view.nbytes] = view
+        return Slot(index, view.nbytes)
+
+    def read(self, slot):
+        offset = slot.index * self.size
+        return self.memory.buf[offset:offset + slot.size]
+
+    def close(self, unlink=False):
+        self.closed = True
+        self.memory.close()
+        if unlink:
+            self.memory.unlink()
+
+
+def transmit(conn, ring, values):
+    """Sends batch of events placing bytes payloads into ring."""
+    if ring is None:
+        if values:
+            conn.send(values)
+        return
+    message = []
+    for value in values:
+        if ring.fits(value):
+            if not ring.acquire(block=False):
+                # let reader consume (and release) already written slots
+                if message:
+                    conn.send(message)
+                    message = []
+                ring.acquire()
+            value = ring.write(value)
+        message.append(value)
+    if message:
+        conn.send(message)
+
+
+class Getter:
+    """Worker side getter with bulk `get_many` method.
+
+    Shared memory payloads are returned as memoryviews valid until
+    the next getter call.
+    """
+
+    def __init__(self, conn, ring):
+        self.conn = conn
+        self.ring = ring
+        self.items = collections.deque()
+        self.views = []
+        self.finished = False
+
+    def release(self):
+        for view in self.views:
+            view.release()
+        if self.views:
+            self.ring.release(len(self.views))
+            self.views.clear()
+
+    def load(self, value):
+        if isinstance(value, Slot):
+            value = self.ring.read(value)
+            self.views.append(value)
+        return value
+
+    def fill(self):
+        if self.items or self.finished:
+            return
+        self.release()
+        try:
+            message = self.conn.recv()
+        except EOFError:
+            message = None
+        if message is None:
+            self.finished = True
+            return
+        if self.ring is not None:
+            message = [self.load(x) for x in message]
+        self.items.extend(message)
+
+    def get_many(self, limit=None):
+        self.fill()
+        if not self.items:
+            return [DATA_FINISH_MARKER]
+        count = len(self.items) if limit is None else limit
+        result = []
+        while self.items and len(result) < count:
+            result.append(self.items.popleft())
+        return result
+
+    def get(self):
+        return self.get_many(1)[0]
+
+    def __call__(self):
+        return self.get()
+
+
+class Putter:
+    """Worker side putter with bulk `put_many` method."""
+
+    def __init__(self, conn, ring):
+        self.conn = conn
+        self.ring = ring
+
+    def put_many(self, values):
+        values = list(values)
+        for index, value in enumerate(values):
+            if value is DATA_FINISH_MARKER:
+                transmit(self.conn, self.ring, values[:index])
+                self.conn.send(None)
+                return
+        transmit(self.conn, self.ring, values)
+
+    def put(self, value):
+        self.put_many([value])
+
+    def __call__(self, value):
+        return self.put(value)
+
+
+def worker(func, reader, writer, inbound, outbound):
+    """Entry point of worker process."""
+    getter = Getter(reader, inbound)
+    try:
+        func(getter, Putter(writer, outbound))
+    except Exception:
+        writer.send(Failure(traceback.format_exc()))
+    finally:
+        getter.release()
+        for ring in (inbound, outbound):
+            if ring is not None:
+                ring.close()
+        writer.close()
+
+
+class Process(Proc, Actor):
+    """Process actor.
+
+    Runs `func(getter, putter)` (the contract of Thread actor) in
+    a subprocess. Events are pickled in batches, bytes payloads can be
+    transferred through shared memory rings instead.
+    """
+
+    @dataclasses.dataclass
+    class Options:
+        capacity: int = CHUNK_SIZE
+        '''Capacity of channels between event loop and transport.'''
+
+        context: Optional[str] = None
+        '''Multiprocessing start method (fork, spawn, forkserver).'''
+
+        shared: Optional[int] = None
+        '''Slot size of shared memory rings for bytes payloads.'''
+
+        slots: int = 16
+        '''Number of slots in shared memory rings.'''
+
+    @dataclasses.dataclass
+    class Arguments(Options):
+        func: Callable[
+            [
+                Callable[[], Any],
+                Callable[[Any], None],
+            ],
+            None,
+        ] = None
+        name: Optional[str] = None
+
+    q2t: Channel
+    t2q: Channel
+
+    def forward(self, conn, ring):
+        try:
+            while True:
+                chunk = self.q2t.get_many()
+                if chunk[-1] is DATA_FINISH_MARKER:
+                    transmit(conn, ring, chunk[:-1])
+                    conn.send(None)
+                    return
+                transmit(conn, ring, chunk)
+        except BrokenPipeError:
+            # worker is gone, the reason is reported by collect
+            pass
+
+    def collect(self, conn, ring, process):
+        finished = False
+        while True:
+            try:
+                message = conn.recv()
+            except EOFError:
+                process.join()
+                if process.exitcode:
+                    raise ProcessWorkerError(
+                        f'exit code {process.exitcode}',
+                    ) from None
+                message = None
+            if isinstance(message, Failure):
+                raise ProcessWorkerError(message.traceback)
+            if finished:
+                if message is None:
+                    return
+                continue
+            if message is None:
+                finished = True
+                self.t2q.put(DATA_FINISH_MARKER)
+                continue
+            if ring is not None:
+                message = [self.load(ring, x) for x in message]
+            self.t2q.put_many(message)
+
+    @staticmethod
+    def load(ring, value):
+        if isinstance(value, Slot):
+            view = ring.read(value)
+            value = bytes(view)
+            view.release()
+            ring.release()
+        return value
+
+    async def feed(self):
+        async for chunk in receiver(self.receive, CHUNK_SIZE):
+            await self.q2t.send_many(chunk)
+        await self.q2t.send_many([DATA_FINISH_MARKER])
+
+    async def drain(self):
+        while True:
+            chunk = await self.t2q.receive_many()
+            await self.send_many(chunk, safe=True)
+            if chunk[-1] is DATA_FINISH_MARKER:
+                return
+
+    async def main(self):
+        context = multiprocessing.get_context(self.config.context)
+        rings = [None, None]
+        if self.config.shared is not None:
+            rings = [
+                Ring(context, self.config.slots, self.config.shared)
+                for _ in rings
+            ]
+        inbound = context.Pipe(duplex=False)
+        outbound = context.Pipe(duplex=False)
+        process = context.Process(
+            target=worker,
+            args=(self.config.func, inbound[0], outbound[1], *rings),
+            daemon=True,
+            name=self.config.name,
+        )
+        process.start()
+        inbound[0].close()
+        outbound[1].close()
+
+        transport = [
+            spawn(self.forward, inbound[1], rings[0]),
+            spawn(self.collect, outbound[0], rings[1], process),
+        ]
+        tasks = [asyncio.ensure_future(self.drain())]
+        if self.getter is not None:
+            tasks.append(asyncio.ensure_future(self.feed()))
+        else:
+            self.q2t.close()
+        try:
+            # transport threads are awaited in cleanup even if cancelled
+            await asyncio.gather(*map(asyncio.shield, transport), *tasks)
+        finally:
+            # unblock transport threads and wait for them before cleanup
+            for task in tasks:
+                task.cancel()
+            self.q2t.close()
+            self.t2q.close()
+            if process.is_alive():
+                process.terminate()
+            for ring in rings:
+                if ring is not None:
+                    ring.closed = True
+            await asyncio.gather(*transport, *tasks, return_exceptions=True)
+            inbound[1].close()
+            outbound[0].close()
+            for ring in rings:
+                if ring is not None:
+                    ring.close(unlink=True)
+            await spawn(process.join)
+
+    def start(self):
+        self.q2t = Channel(self.config.capacity)
+        self.t2q = Channel(self.config.capacity)
+        return super().start()
@@ -0,0 +1,145 @@
+"""Profiler attributing wall, CPU and await time to actors of flow.
+
+Start coroutine of every leaf actor is wrapped with awaitable proxy
+measuring each step of it (time between resumption and suspension).
+"""
+import dataclasses
+import time
+from typing import Optional
+
+from .core import Connector
+
+
+@dataclasses.dataclass
+class Stats:
+    """Profile of single actor."""
+
+    steps: int = 0
+    busy: float = 0
+    '''Wall time of steps (actor code was running).'''
+
+    cpu: float = 0
+    '''CPU time of steps.'''
+
+    started: Optional[float] = None
+    finished: Optional[float] = None
+
+    @property
+    def wall(self):
+        if self.started is None:
+            return 0
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def blocked(self):
+        """Wall time of steps spent off CPU (e.g. in blocking calls)."""
+        return max(0, self.busy - self.cpu)
+
+    @property
+    def awaiting(self):
+        """Wall time actor was suspended (e.g. by backpressure)."""
+        return max(0, self.wall - self.busy)
+
+
+class Stepper:
+    """Awaitable proxy measuring steps of wrapped awaitable."""
+
+    def __init__(self, awaitable, stats):
+        self.awaitable = awaitable
+        self.stats = stats
+
+    def __await__(self):
+        iterator = self.awaitable.__await__()
+        stats = self.stats
+        stats.started = time.perf_counter()
+        value, error = None, None
+        try:
+            while True:
+                wall, cpu = time.perf_counter(), time.thread_time()
+                try:
+                    if error is None:
+                        signal = iterator.send(value)
+                    else:
+                        signal = iterator.throw(error)
+                except StopIteration as exc:
+                    return exc.value
+                finally:
+                    stats.busy += time.perf_counter() - wall
+                    stats.cpu += time.thread_time() - cpu
+                    stats.steps += 1
+                try:
+                    value, error = (yield signal), None
+                except BaseException as exc:
+                    value, error = None, exc
+        finally:
+            stats.finished = time.perf_counter()
+
+
+class Profiler:
+    """Registry of actors profiles of instrumented flows."""
+
+    def __init__(self):
+        self.stats = {}
+
+    def instrument(self, flow):
+        """Wraps start of every leaf actor of flow with profiling proxy."""
+        wrapped = set()
+        index = 0
+
+        def walk(actor, path):
+            nonlocal index
+            if isinstance(actor, Connector):
+                path = (*path, repr(actor))
+                walk(actor.config.left, path)
+                walk(actor.config.right, path)
+                return
+            path = (*path, f'{actor!r}[{index}]')
+            index += 1
+            if id(actor) in wrapped:
+                return
+            wrapped.add(id(actor))
+            stats = self.stats[path] = Stats()
+            start = actor.start
+            actor.start = lambda: Stepper(start(), stats)
+
+        walk(flow, ())
+        return flow
+
+    def snapshot(self):
+        """Returns dict of actors profiles keyed by their paths."""
+        return {
+            ';'.join(path): {
+                'steps': stats.steps,
+                'wall': stats.wall,
+                'cpu': stats.cpu,
+                'blocked': stats.blocked,
+                'await': stats.awaiting,
+            }
+            for path, stats in self.stats.items()
+        }
+
+    def collapsed(self):
+        """Returns profile as collapsed stacks (in microseconds).
+
+        Output can be fed directly to flame graph tools, e.g.
+        `flamegraph.pl` or speedscope.
+        """
+        lines = []
+        for path, stats in self.stats.items():
+            stack = ';'.join(x.replace(';', ',') for x in path)
+            for name, value in (
+                ('cpu', stats.cpu),
+                ('blocked', stats.blocked),
+                ('await', stats.awaiting),
+            ):
+                value = round(value * 1e6)
+                if value:
+                    lines.append(f'{stack};{name} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+def profile(flow, profiler=None):
+    """Instruments flow and returns its profiler."""
+    profiler = profiler or Profiler()
+    profiler.instrument(flow)
+    return profiler
@@ -1,14 +1,57 @@
 import asyncio
+import concurrent.futures
 import dataclasses
+import functools
 import inspect
 import logging
+import pickle
 import sys
 from typing import Any, Callable, Optional, TextIO
 
-from .core import DATA_FINISH_MARKER, Actor, Proc, Sink, Source, receiver
+from .channels import DropNewestQueue, DropOldestQueue
+from .core import (
+    CHUNK_SIZE,
+    DATA_FINISH_MARKER,
+    Actor,
+    ActorOptionValueError,
+    Connector,
+    Proc,
+    Sink,
+    Source,
+    receiver,
+    resolve,
+    send_many,
+)
 
 
 APPLICATOR_IGNORE = object()
+PROCESS_POOLS = {}
+
+
+class ApplicatorProcessError(RuntimeError):
+    def __init__(self, func):
+        super().__init__(
+            f'function can not be executed in separate process: "{func!r}"',
+        )
+
+
+def process_pool(workers=None):
+    """Returns default process pool of given size.
+
+    Pool is shared by all actors of the process with the same pool size
+    and lives until interpreter exit. Flow specific pool should be
+    passed to actors as `executor` argument instead.
+    """
+    if workers not in PROCESS_POOLS:
+        PROCESS_POOLS[workers] = concurrent.futures.ProcessPoolExecutor(
+            workers,
+        )
+    return PROCESS_POOLS[workers]
+
+
+def apply_chunk(func, chunk):
+    """Applies function to chunk of events (executed in executors)."""
+    return [func(data) for data in chunk]
 
 
 class Ticker(Source, Actor):
@@ -41,9 +84,9 @@ class Counter(Proc, Actor):
 
     async def main(self):
         counter = 0
-        async for _ in receiver(self.receive):
-            await self.send(counter)
-            counter += 1
+        async for chunk in receiver(self.receive, chunk=CHUNK_SIZE):
+            await self.send_many(range(counter, counter + len(chunk)))
+            counter += len(chunk)
         await self.send(DATA_FINISH_MARKER)
 
 
@@ -56,15 +99,18 @@ class Printer(Sink, Actor):
         '''The stream to be used for printing.'''
 
     async def main(self):
-        async for data in receiver(self.receive):
-            print(data, file=self.config.stream, flush=True)
+        stream = self.config.stream
+        async for chunk in receiver(self.receive, chunk=CHUNK_SIZE):
+            for data in chunk:
+                print(data, file=stream)
+            stream.flush()
 
 
 class Null(Sink, Actor):
     """Sink actor eating all incoming events."""
 
     async def main(self):
-        async for _ in receiver(self.receive):
+        async for _ in receiver(self.receive, chunk=CHUNK_SIZE):
             pass
 
 
@@ -81,9 +127,10 @@ class Logger(Proc, Actor):
 
     async def main(self):
         logger = logging.getLogger(self.config.logger)
-        async for data in receiver(self.receive):
-            logger.log(self.config.level, data)
-            await self.send(data, safe=True)
+        async for chunk in receiver(self.receive, chunk=CHUNK_SIZE):
+            for data in chunk:
+                logger.log(self.config.level, data)
+            await self.send_many(chunk, safe=True)
         await self.send(DATA_FINISH_MARKER)
 
 
@@ -99,6 +146,38 @@ class Applicator(Proc, Actor):
         asyncio thread to avoid blocking.
         '''
 
+        process: bool = False
+        '''Execute function in separate process.
+
+        This option is usefull for cpu-bound tasks. Function and events
+        should be picklable, function result is processed in main process.
+        Not supported by actors applying their own function to events
+        (e.g. Batcher, Unbatch or Take).
+        '''
+
+        workers: Optional[int] = None
+        '''Size of default process pool (number of CPUs by default).
+
+        Default pools are shared between all flows, use `executor` to
+        have pool of the flow.
+        '''
+
+        chunksize: int = 1
+        '''Maximum number of available events submitted to executor at once.'''
+
+        concurrency: int = 1
+        '''Maximum number of events (chunks) processed concurrently.
+
+        This option is usefull for io-bound async functions. Incoming events
+        are not received while all slots of processing window are busy.
+        '''
+
+        ordered: bool = True
+        '''Send results of concurrent processing in order of events.
+
+        Otherwise results are sent as soon as they are ready.
+        '''
+
     @dataclasses.dataclass
     class Arguments(Options):
         func: Callable[[Any], Any] = None
@@ -107,8 +186,51 @@ class Applicator(Proc, Actor):
         options: bool = True
         '''Whether to yield options.'''
 
+        executor: Optional[concurrent.futures.Executor] = None
+        '''Executor to be used instead of default thread or process pool.
+
+        Allows to share pool of specific size between actors of the flow
+        and to shut it down with the flow (caller owns the executor).
+        '''
+
+        applies_func = True
+        '''Whether actor applies `func` to events (could be offloaded).'''
+
+        def __post_init__(self):
+            self.validate()
+
+        def validate(self):
+            """Checks that function could be executed in process mode."""
+            if not self.process:
+                return
+            try:
+                if not self.applies_func:
+                    raise TypeError('actor applies its own function')
+                if self.func is None:
+                    raise TypeError('function is not defined')
+                pickle.dumps(self.func)
+            except Exception as exc:
+                raise ApplicatorProcessError(self.func) from exc
+
+    def configure(self, options):
+        super().configure(options)
+        self.config.validate()
+
     def func(self, data):
-        return self.config.func(data)
+        return self.result(data, self.config.func(data))
+
+    def result(self, data, value):
+        """Converts function value for data to actor result."""
+        return value
+
+    @property
+    def inline(self):
+        """Whether function could be executed inline by Fused actor."""
+        return not (
+            self.config.thread
+            or self.config.process
+            or self.config.concurrency > 1
+        )
 
     def finish(self):
         return APPLICATOR_IGNORE
@@ -137,19 +259,112 @@ class Applicator(Proc, Actor):
             await self.send(result)
         return False
 
+    @property
+    def executor(self):
+        if self.config.executor is not None:
+            return self.config.executor
+        if self.config.process:
+            return process_pool(self.config.workers)
+        return None
+
+    async def execute(self, chunk):
+        """Executes function on chunk of events in executor."""
+        loop = asyncio.get_running_loop()
+        if self.config.process:
+            values = await loop.run_in_executor(
+                self.executor,
+                functools.partial(apply_chunk, self.config.func),
+                chunk,
+            )
+            return map(self.result, chunk, values)
+        return await loop.run_in_executor(
+            self.executor,
+            functools.partial(apply_chunk, self.func),
+            chunk,
+        )
+
+    async def evaluate(self, chunk):
+        """Calculates results for chunk of events awaiting coroutines."""
+        results = (
+            await self.execute(chunk)
+            if self.config.thread or self.config.process else
+            map(self.func, chunk)
+        )
+        return [
+            await result
+            if asyncio.isfuture(result) or (
+                asyncio.iscoroutine(result)
+                and not inspect.isgenerator(result)
+            ) else
+            result
+            for result in results
+        ]
+
+    async def sequential(self):
+        """Processes events one by one, returns True if finished early."""
+        offload = self.config.thread or self.config.process
+        limit = self.config.chunksize if offload else CHUNK_SIZE
+        async for chunk in receiver(self.receive, chunk=limit):
+            results = (
+                await self.execute(chunk)
+                if offload else
+                map(self.func, chunk)
+            )
+            for result in results:
+                if await self.process(result):
+                    return True
+        return False
+
+    async def concurrent(self):
+        """Processes events concurrently, returns True if finished early.
+
+        Number of events being processed is limited by semaphore which is
+        released only after result is sent, so window is never exceeded
+        and slow downstream blocks receiving of new events.
+        """
+        offload = self.config.thread or self.config.process
+        limit = self.config.chunksize if offload else 1
+        window = asyncio.Semaphore(self.config.concurrency)
+        results = asyncio.Queue()
+        tasks = set()
+
+        async def read():
+            async for chunk in receiver(self.receive, chunk=limit):
+                await window.acquire()
+                task = asyncio.ensure_future(self.evaluate(chunk))
+                tasks.add(task)
+                if self.config.ordered:
+                    results.put_nowait(task)
+                else:
+                    task.add_done_callback(results.put_nowait)
+            # wait for all results to be sent
+            for _ in range(self.config.concurrency):
+                await window.acquire()
+
+        reader = asyncio.ensure_future(read())
+        reader.add_done_callback(results.put_nowait)
+        try:
+            while True:
+                task = await results.get()
+                if task is reader:
+                    reader.result()
+                    return False
+                for result in await task:
+                    if await self.process(result):
+                        return True
+                tasks.discard(task)
+                window.release()
+        finally:
+            reader.cancel()
+            for task in tasks:
+                task.cancel()
+
     async def main(self):
-        exit = False
-        async for data in receiver(self.receive):
-            if self.config.thread:
-                loop = asyncio.get_running_loop()
-                result = await loop.run_in_executor(None, self.func, data)
-                await self.send(result)
-                exit = (result is DATA_FINISH_MARKER)
-            else:
-                result = self.func(data)
-                exit = await self.process(result)
-            if exit:
-                break
+        exit = await (
+            self.concurrent()
+            if self.config.concurrency > 1 else
+            self.sequential()
+        )
         if not exit:
             result = self.finish()
             await self.process(result)
@@ -163,40 +378,97 @@ class Applicator(Proc, Actor):
 class Filter(Applicator):
     """Interim actor filtering events with predicate."""
 
-    def func(self, data):
-        return data if self.config.func(data) else APPLICATOR_IGNORE
+    def result(self, data, value):
+        return data if value else APPLICATOR_IGNORE
+
+
+@dataclasses.dataclass
+class Branch:
+    """Tee side branch with its own buffering."""
+
+    sink: Sink
+    '''Sink to be fed with events.'''
+
+    capacity: Optional[int] = 1
+    '''Capacity of branch channel, `None` makes it unbounded.'''
+
+    policy: str = 'block'
+    '''Overflow policy: `block`, `drop` newest or `sample` latest events.'''
+
+
+TEE_POLICIES = {
+    'block': asyncio.Queue,
+    'drop': DropNewestQueue,
+    'sample': DropOldestQueue,
+}
 
 
 class Tee(Proc, Actor):
-    """Interim actor feeding events to additional Sink."""
+    """Interim actor feeding events to additional Sinks.
+
+    Each side sink has its own channel, so with `drop` or `sample`
+    overflow policy slow side sink never blocks main flow.
+    """
 
     @dataclasses.dataclass
     class Arguments:
-        sink: Sink
-        '''Function to be applied on events.'''
+        sink: Sink = None
+        '''Side sink (or Branch) to be fed with events.'''
 
-    queue: asyncio.Queue = None
+        sinks: list = ()
+        '''Additional side sinks (or Branches).'''
 
-    async def main(self):
-        async def send(data):
-            await asyncio.gather(
-                self.queue.put(data),
-                self.send(data),
+        capacity: Optional[int] = 1
+        '''Default capacity of side branches channels.'''
+
+        policy: str = 'block'
+        '''Default overflow policy of side branches.
+
+        `block` waits for free space, `drop` drops incoming events and
+        `sample` drops oldest events keeping latest ones.
+        '''
+
+    queues: list = None
+
+    @property
+    def branches(self):
+        return [
+            sink if isinstance(sink, Branch) else Branch(
+                sink=sink,
+                capacity=self.config.capacity,
+                policy=self.config.policy,
             )
-        async for data in receiver(self.receive):
-            await send(data)
-        await send(DATA_FINISH_MARKER)
+            for sink in (self.config.sink, *self.config.sinks)
+            if sink is not None
+        ]
+
+    async def main(self):
+        async for chunk in receiver(self.receive, chunk=CHUNK_SIZE):
+            for queue in self.queues:
+                await send_many(queue.put, chunk)
+            await self.send_many(chunk)
+        # finish main flow first: finish marker is never dropped, so it
+        # waits for free space in side branches channels
+        await self.send(DATA_FINISH_MARKER)
+        for queue in self.queues:
+            await queue.put(DATA_FINISH_MARKER)
 
     def start(self):
-        self.queue = asyncio.Queue(maxsize=1)
-        self.config.sink.getter = self.queue.get
+        self.queues = []
+        branches = self.branches
+        for branch in branches:
+            if branch.policy not in TEE_POLICIES:
+                raise ActorOptionValueError('policy', branch.policy)
+            queue = TEE_POLICIES[branch.policy](branch.capacity or 0)
+            branch.sink.getter = queue.get
+            self.queues.append(queue)
         return asyncio.gather(
-            self.config.sink.start(),
+            *(branch.sink.start() for branch in branches),
             super().start(),
         )
 
     def __repr__(self):
-        return f'Tee({self.config.sink})'
+        return f'Tee({", ".join(str(x.sink) for x in self.branches)})'
 
 
 class List(Source, Actor):
@@ -208,8 +480,7 @@ class List(Source, Actor):
         '''List of objects to be generated as events.'''
 
     async def main(self):
-        for element in self.config.data:
-            await self.send(element)
+        await self.send_many(self.config.data)
         await self.send(DATA_FINISH_MARKER)
 
 
@@ -223,25 +494,104 @@ class Batcher(Applicator):
         size: int = None
         '''Size of batch to be produced.'''
 
+        latency: Optional[float] = None
+        '''Maximum time in seconds first event waits in partial batch.
+
+        Partial batch is flushed on timer even if there are no new events.
+        '''
+
+        max_bytes: Optional[int] = None
+        '''Maximum total size of events in batch (see `sizeof`).
+
+        Batch is flushed before event which would exceed the budget and
+        as soon as the budget is reached (oversized event is sent alone).
+        '''
+
     @dataclasses.dataclass
     class Arguments(Options, Applicator.Arguments):
-        pass
+        sizeof: Callable[[Any], int] = len
+        '''Function calculating size of event in bytes.'''
+
+        applies_func = False
+
+    volume: int = 0
 
     def func(self, data):
+        batches = []
+        if self.config.max_bytes is not None:
+            size = self.config.sizeof(data)
+            if self.batch and self.volume + size > self.config.max_bytes:
+                batches.append(self.finish())
+            self.volume += size
         if self.batch is None:
             self.batch = []
         self.batch.append(data)
-        result = APPLICATOR_IGNORE
-        if len(self.batch) == self.config.size:
-            self.batch, result = None, self.batch
-        return result
+        if len(self.batch) == self.config.size or (
+            self.config.max_bytes is not None
+            and self.volume >= self.config.max_bytes
+        ):
+            batches.append(self.finish())
+        if len(batches) > 1:
+            return (batch for batch in batches)
+        return batches[0] if batches else APPLICATOR_IGNORE
 
     def finish(self):
         result = APPLICATOR_IGNORE
         if self.batch:
             result, self.batch = self.batch, None
+            self.volume = 0
         return result
 
+    @property
+    def inline(self):
+        return super().inline and self.config.latency is None
+
+    async def sequential(self):
+        if self.config.latency is None:
+            return await super().sequential()
+        loop = asyncio.get_running_loop()
+        deadline = None
+        receive = None
+        try:
+            while True:
+                if receive is None:
+                    receive = asyncio.ensure_future(resolve(self.receive()))
+                timeout = (
+                    None
+                    if deadline is None else
+                    max(deadline - loop.time(), 0)
+                )
+                done, _ = await asyncio.wait((receive,), timeout=timeout)
+                if not done:
+                    deadline = None
+                    await self.process(self.finish())
+                    continue
+                data, receive = receive.result(), None
+                if data is DATA_FINISH_MARKER:
+                    return False
+                result = self.func(data)
+                if result is not APPLICATOR_IGNORE:
+                    deadline = None
+                    await self.process(result)
+                if not self.batch:
+                    deadline = None
+                elif deadline is None:
+                    deadline = loop.time() + self.config.latency
+        finally:
+            if receive is not None:
+                receive.cancel()
+
+
+class Unbatch(Applicator):
+    """Interim actor flattening batches into separate events."""
+
+    @dataclasses.dataclass
+    class Arguments(Applicator.Arguments):
+        applies_func = False
+
+    def func(self, data):
+        yield from data
+
 
 class Producer(Source, Actor):
     """Source actor producing events from provided function."""
@@ -308,7 +658,7 @@ class Take(Applicator):
 
     @dataclasses.dataclass
     class Arguments(Options, Applicator.Arguments):
-        pass
+        applies_func = False
 
     limit: int = None
 
@@ -350,5 +700,292 @@ class Consumer(Sink, Actor):
             self.func = inner
 
     async def main(self):
+        async for chunk in receiver(self.receive, chunk=CHUNK_SIZE):
+            for data in chunk:
+                await self.func(data)
+
+
+class Shard(Proc, Actor):
+    """Interim actor partitioning events by key between worker flows.
+
+    Events with the same key are always processed by the same worker
+    (in order of their arrival). Results of all workers are merged into
+    single output stream which is finished after all workers are finished.
+    Workers are created by factory and could be any actors or flows,
+    e.g. Applicator, aioflows.thread.Thread or their connections.
+    """
+
+    @dataclasses.dataclass
+    class Options:
+        workers: int = 2
+        '''Number of workers.'''
+
+        capacity: Optional[int] = 1
+        '''Capacity of workers input channels.'''
+
+    @dataclasses.dataclass
+    class Arguments(Options):
+        factory: Callable[[], Actor] = None
+        '''Function creating worker.'''
+
+        key: Callable[[Any], Any] = None
+        '''Function calculating event key (event itself by default).'''
+
+    async def merge(self, data):
+        if data is not DATA_FINISH_MARKER:
+            await self.send(data, safe=True)
+
+    async def route(self, queues):
+        key = self.config.key
         async for data in receiver(self.receive):
-            await self.func(data)
+            index = hash(data if key is None else key(data)) % len(queues)
+            await queues[index].put(data)
+        for queue in queues:
+            await queue.put(DATA_FINISH_MARKER)
+
+    async def main(self):
+        queues = []
+        tasks = []
+        for _ in range(self.config.workers):
+            queue = asyncio.Queue(self.config.capacity or 0)
+            worker = self.config.factory()
+            worker.getter = queue.get
+            worker.putter = self.merge
+            queues.append(queue)
+            tasks.append(asyncio.ensure_future(worker.start()))
+        tasks.append(asyncio.ensure_future(self.route(queues)))
+        try:
+            done, _ = await asyncio.wait(
+                tasks,
+                return_when=asyncio.FIRST_EXCEPTION,
+            )
+            [x.result() for x in done]
+        finally:
+            for task in tasks:
+                task.cancel()
+        await self.send(DATA_FINISH_MARKER, safe=True)
+
+
+class Merge(Source, Actor):
+    """Source actor merging events of multiple sources into one stream.
+
+    Stream is finished after all sources are finished.
+    """
+
+    @dataclasses.dataclass
+    class Options:
+        policy: str = 'first'
+        '''Merge policy: `first` available event or `round-robin`.'''
+
+        capacity: Optional[int] = 1
+        '''Capacity of sources output channels.'''
+
+    @dataclasses.dataclass
+    class Arguments(Options):
+        sources: list = ()
+        '''Sources (actors or flows) to be merged.'''
+
+    async def first(self, queue):
+        finished = 0
+        while finished < len(self.config.sources):
+            data = await queue.get() if queue.empty() else queue.get_nowait()
+            if data is DATA_FINISH_MARKER:
+                finished += 1
+            else:
+                await self.send(data)
+
+    async def round_robin(self, queues, ready):
+        active = list(queues)
+        while active:
+            received = False
+            for queue in list(active):
+                if queue.empty():
+                    continue
+                received = True
+                data = queue.get_nowait()
+                if data is DATA_FINISH_MARKER:
+                    active.remove(queue)
+                else:
+                    await self.send(data)
+            if not received:
+                ready.clear()
+                await ready.wait()
+
+    async def main(self):
+        sources = self.config.sources
+        capacity = self.config.capacity or 0
+        if self.config.policy == 'first':
+            queue = asyncio.Queue(capacity)
+            for source in sources:
+                source.putter = queue.put
+            merge = self.first(queue)
+        elif self.config.policy == 'round-robin':
+            ready = asyncio.Event()
+            queues = [asyncio.Queue(capacity) for _ in sources]
+
+            def putter(queue):
+                async def put(data):
+                    await queue.put(data)
+                    ready.set()
+                return put
+
+            for source, queue in zip(sources, queues):
+                source.putter = putter(queue)
+            merge = self.round_robin(queues, ready)
+        else:
+            raise ActorOptionValueError('policy', self.config.policy)
+        tasks = [asyncio.ensure_future(x.start()) for x in sources]
+        tasks.append(asyncio.ensure_future(merge))
+        try:
+            done, _ = await asyncio.wait(
+                tasks,
+                return_when=asyncio.FIRST_EXCEPTION,
+            )
+            [x.result() for x in done]
+        finally:
+            for task in tasks:
+                task.cancel()
+        await self.send(DATA_FINISH_MARKER)
+
+
+class Fused(Proc, Actor):
+    """Interim actor executing chain of Applicators inline.
+
+    Each event is passed through all stages without channels between them.
+    Usually created by `fuse` optimization pass.
+    """
+
+    @dataclasses.dataclass
+    class Arguments:
+        stages: list
+        '''Applicators to be executed in flow order.'''
+
+    @property
+    def options(self):
+        return tuple(
+            option
+            for stage in self.config.stages
+            for option in stage.options
+        )
+
+    def configure(self, options):
+        """Configures stages with provided options."""
+        for stage in self.config.stages:
+            count = len(stage.options)
+            if options[:count]:
+                stage.configure(options[:count])
+            options = options[count:]
+
+    async def feed(self, index, data):
+        """Passes data through stages starting from index.
+
+        Returns:
+            Index of stage finished the stream or None.
+        """
+        if index == len(self.config.stages):
+            await self.send(data)
+            return None
+        return await self.process(index, self.config.stages[index].func(data))
+
+    async def process(self, index, result):
+        if (
+            asyncio.iscoroutine(result)
+            and not inspect.isgenerator(result)
+        ):
+            result = asyncio.ensure_future(result)
+        if asyncio.isfuture(result):
+            result = await result
+        exit = None
+        if inspect.isasyncgen(result):
+            async for item in result:
+                if item is DATA_FINISH_MARKER:
+                    return index
+                exit = await self.feed(index + 1, item)
+                if exit is not None:
+                    break
+        elif inspect.isgenerator(result):
+            for item in result:
+                if item is DATA_FINISH_MARKER:
+                    return index
+                exit = await self.feed(index + 1, item)
+                if exit is not None:
+                    break
+        elif result is DATA_FINISH_MARKER:
+            return index
+        elif result is not APPLICATOR_IGNORE:
+            exit = await self.feed(index + 1, result)
+        return exit
+
+    async def main(self):
+        stages = self.config.stages
+        exit = None
+        async for chunk in receiver(self.receive, chunk=CHUNK_SIZE):
+            for data in chunk:
+                exit = await self.feed(0, data)
+                if exit is not None:
+                    break
+            if exit is not None:
+                break
+        # stages after finished one are flushed in order the same way
+        # as they would be flushed on finish marker in separate actors
+        index = 0 if exit is None else exit + 1
+        while index < len(stages):
+            exit = await self.process(index, stages[index].finish())
+            index = index + 1 if exit is None else exit + 1
+        await self.send(DATA_FINISH_MARKER)
+
+    def __repr__(self):
+        return f'Fused({" >> ".join(map(repr, self.config.stages))})'
+
+
+def fusible(actor):
+    """Checks whether actor can be executed inline by Fused."""
+    return (
+        isinstance(actor, Applicator)
+        and type(actor).main is Applicator.main
+        and actor.inline
+    )
+
+
+def fuse(flow):
+    """Fuses adjacent Applicators of the flow into Fused actors.
+
+    Removes channels (and tasks) between Applicator based stages joined
+    by default non-cancelling connection (widened or custom channels
+    are kept as buffers configured by user). Should be called after flow
+    configuration because actors options are checked on fusing.
+
+    Returns:
+        Optimized flow or flow itself if there is nothing to fuse.
+    """
+    if not isinstance(flow, Connector):
+        return flow
+    actors, joints = flow.plan()
+    edges = {mid: connector.config for connector, _, mid, _ in joints}
+    groups = [[0, actors[0]]]
+    for index, actor in enumerate(actors[1:], 1):
+        edge = edges[index]
+        if (
+            fusible(groups[-1][-1])
+            and fusible(actor)
+            and not edge.cancel
+            and edge.capacity == 1
+            and edge.channel is asyncio.Queue
+        ):
+            groups[-1].append(actor)
+        else:
+            groups.append([index, actor])
+    if len(groups) == len(actors):
+        return flow
+    result = None
+    for index, *stages in groups:
+        actor = stages[0] if len(stages) == 1 else Fused(stages=stages)
+        if result is None:
+            result = actor
+        else:
+            result = Connector(**dict(
+                vars(edges[index]),
+                left=result,
+                right=actor,
+            ))
+    return result
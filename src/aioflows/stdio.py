@@ -1,9 +1,161 @@
-from aioconsole.stream import ainput
+import asyncio
+import contextlib
+import dataclasses
+import os
+import sys
+from typing import Any
 
-from .core import Actor, Source
+from .core import CHUNK_SIZE, DATA_FINISH_MARKER, Actor, Sink, Source, receiver
+
+
+@contextlib.contextmanager
+def duplicate(file, mode):
+    """Yields duplicate of file to be owned by actor.
+
+    Duplicate shares blocking mode with file (pipe transports make it
+    non-blocking), so the mode of file is restored on exit.
+    """
+    fd = file.fileno()
+    blocking = os.get_blocking(fd)
+    result = os.fdopen(os.dup(fd), mode)
+    try:
+        yield result
+    finally:
+        result.close()
+        os.set_blocking(fd, blocking)
 
 
 class Stdin(Source, Actor):
+    """Source actor reading stdin (or other file) through pipe transport.
+
+    Data is read in large chunks and split into lines (without line
+    separators) in batches. Regular files are read in executor. Stream
+    is finished on EOF.
+    """
+
+    @dataclasses.dataclass
+    class Arguments:
+        file: Any = None
+        '''File to be read, stdin by default.'''
+
+        binary: bool = False
+        '''Send raw bytes chunks instead of decoded lines.'''
+
+        size: int = 2 ** 16
+        '''Size of chunks to be read.'''
+
+        encoding: str = 'utf-8'
+        '''Encoding of lines.'''
+
+    def lines(self, data):
+        lines = data.split(b'\n')
+        return lines.pop(), [
+            x.decode(self.config.encoding)
+            for x in lines
+        ]
+
+    async def main(self):
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader(limit=self.config.size)
+        transport = None
+        with duplicate(self.config.file or sys.stdin, 'rb') as file:
+            try:
+                try:
+                    transport, _ = await loop.connect_read_pipe(
+                        lambda: asyncio.StreamReaderProtocol(reader),
+                        file,
+                    )
+                    read = reader.read
+                except ValueError:
+                    # regular files are not supported by pipe transports
+                    def read(size):
+                        return loop.run_in_executor(None, file.read, size)
+                rest = b''
+                while True:
+                    data = await read(self.config.size)
+                    if not data:
+                        break
+                    if self.config.binary:
+                        await self.send(data)
+                        continue
+                    rest, lines = self.lines(rest + data)
+                    await self.send_many(lines)
+                if rest:
+                    await self.send(rest.decode(self.config.encoding))
+            finally:
+                if transport is not None:
+                    transport.close()
+        await self.send(DATA_FINISH_MARKER)
+
+
+class WritePipeProtocol(asyncio.Protocol):
+    """Protocol of write pipe transport with flow control."""
+
+    def __init__(self):
+        self.writable = asyncio.Event()
+        self.writable.set()
+        self.closed = asyncio.get_running_loop().create_future()
+
+    def pause_writing(self):
+        self.writable.clear()
+
+    def resume_writing(self):
+        self.writable.set()
+
+    def connection_lost(self, exc):
+        self.writable.set()
+        if not self.closed.done():
+            self.closed.set_result(exc)
+
+
+class Stdout(Sink, Actor):
+    """Sink actor writing events to stdout (or other file).
+
+    Events are written in chunks through pipe transport waiting for
+    free space in its buffer. Regular files are written directly.
+    """
+
+    @dataclasses.dataclass
+    class Options:
+        binary: bool = False
+        '''Write bytes events as is instead of text lines.'''
+
+        encoding: str = 'utf-8'
+        '''Encoding of lines.'''
+
+    @dataclasses.dataclass
+    class Arguments(Options):
+        file: Any = None
+        '''File to be written, stdout by default.'''
+
+    def encode(self, chunk):
+        if self.config.binary:
+            return b''.join(chunk)
+        return ''.join(f'{x}\n' for x in chunk).encode(self.config.encoding)
+
     async def main(self):
-        while True:
-            await self.send(await ainput())
+        loop = asyncio.get_running_loop()
+        file = self.config.file or sys.stdout
+        file.flush()
+        with duplicate(file, 'wb') as file:
+            try:
+                transport, protocol = await loop.connect_write_pipe(
+                    WritePipeProtocol,
+                    file,
+                )
+            except ValueError:
+                # regular files are not supported by pipe transports
+                async for chunk in receiver(self.receive, chunk=CHUNK_SIZE):
+                    file.write(self.encode(chunk))
+                return
+            try:
+                async for chunk in receiver(self.receive, chunk=CHUNK_SIZE):
+                    if not protocol.writable.is_set():
+                        await protocol.writable.wait()
+                    if protocol.closed.done():
+                        raise BrokenPipeError()
+                    transport.write(self.encode(chunk))
+                transport.close()
+                await protocol.closed
+            finally:
+                transport.close()
@@ -1,11 +1,145 @@
 import asyncio
+import collections
 import dataclasses
 import threading
 from typing import Any, Callable, Optional
 
-import janus
+from aioflows.core import (
+    CHUNK_SIZE,
+    DATA_FINISH_MARKER,
+    Actor,
+    ActorOptionValueError,
+    Proc,
+    receiver,
+)
 
-from aioflows.core import Actor, Proc
+
+class Channel:
+    """Bounded channel between thread and event loop.
+
+    Events are moved in batches: every wait of either side is finished
+    with one wakeup no matter how many events were transferred. Closed
+    channel returns finish marker to readers once it is drained.
+    """
+
+    def __init__(self, capacity=CHUNK_SIZE):
+        self.capacity = capacity
+        self.items = collections.deque()
+        self.closed = False
+        self.condition = threading.Condition()
+        self.waiters = []
+
+    def wake(self):
+        # must be called with condition acquired
+        self.condition.notify_all()
+        for waiter in self.waiters:
+            waiter.get_loop().call_soon_threadsafe(self.resolve, waiter)
+        self.waiters.clear()
+
+    @staticmethod
+    def resolve(waiter):
+        if not waiter.done():
+            waiter.set_result(None)
+
+    def take(self, limit):
+        if not self.items:
+            return [DATA_FINISH_MARKER]
+        count = len(self.items) if limit is None else limit
+        result = []
+        while self.items and len(result) < count:
+            result.append(self.items.popleft())
+        self.wake()
+        return result
+
+    def push(self, values, start):
+        if self.closed:
+            raise RuntimeError('channel is closed')
+        space = self.capacity - len(self.items)
+        stop = min(len(values), start + space)
+        self.items.extend(values[start:stop])
+        if stop > start:
+            self.wake()
+        return stop
+
+    def get_many(self, limit=None):
+        """Waits for events and takes all available ones (up to limit)."""
+        with self.condition:
+            while not self.items and not self.closed:
+                self.condition.wait()
+            return self.take(limit)
+
+    def put_many(self, values):
+        """Puts events waiting for free space in channel."""
+        values = list(values)
+        start = 0
+        with self.condition:
+            while True:
+                start = self.push(values, start)
+                if start == len(values):
+                    return
+                self.condition.wait()
+
+    def get(self):
+        return self.get_many(1)[0]
+
+    def put(self, value):
+        self.put_many([value])
+
+    async def wait(self):
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        self.condition.release()
+        try:
+            await waiter
+        finally:
+            self.condition.acquire()
+            if waiter in self.waiters:
+                self.waiters.remove(waiter)
+
+    async def receive_many(self, limit=None):
+        """Async variant of `get_many`."""
+        with self.condition:
+            while not self.items and not self.closed:
+                await self.wait()
+            return self.take(limit)
+
+    async def send_many(self, values):
+        """Async variant of `put_many`."""
+        values = list(values)
+        start = 0
+        with self.condition:
+            while True:
+                start = self.push(values, start)
+                if start == len(values):
+                    return
+                await self.wait()
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.wake()
+
+
+class Getter:
+    """Thread side getter of channel with bulk `get_many` method."""
+
+    def __init__(self, channel):
+        self.get_many = channel.get_many
+        self.get = channel.get
+
+    def __call__(self):
+        return self.get()
+
+
+class Putter:
+    """Thread side putter of channel with bulk `put_many` method."""
+
+    def __init__(self, channel):
+        self.put_many = channel.put_many
+        self.put = channel.put
+
+    def __call__(self, value):
+        return self.put(value)
 
 
 class Thread(Proc, Actor):
@@ -17,43 +151,76 @@ class Thread(Proc, Actor):
                 Callable[[Any], None],
             ],
             None,
-        ]
+        ] = None
         name: Optional[str] = None
 
-    q2t: janus.Queue
-    t2q: janus.Queue
+        capacity: int = CHUNK_SIZE
+        '''Capacity of channels between thread and event loop.'''
+
+        workers: int = 1
+        '''Number of threads sharing incoming and outgoing channels.'''
+
+    q2t: Channel
+    t2q: Channel
 
     def thread_main(self):
-        self.config.func(self.q2t.sync_q.get, self.t2q.sync_q.put)
+        self.config.func(Getter(self.q2t), Putter(self.t2q))
+
+    async def feed(self):
+        async for chunk in receiver(self.receive, CHUNK_SIZE):
+            await self.q2t.send_many(chunk)
+        # every worker is stopped with its own marker
+        await self.q2t.send_many([DATA_FINISH_MARKER] * self.config.workers)
+
+    async def drain(self):
+        # stream is finished only after all workers are finished
+        running = self.config.workers
+        while True:
+            chunk = await self.t2q.receive_many()
+            start = 0
+            for index, data in enumerate(chunk):
+                if data is not DATA_FINISH_MARKER:
+                    continue
+                await self.send_many(chunk[start:index])
+                start = index + 1
+                running -= 1
+                if not running:
+                    await self.send(DATA_FINISH_MARKER)
+                    return
+            await self.send_many(chunk[start:])
+
+    def threads(self):
+        name = self.config.name
+        for index in range(self.config.workers):
+            if name is not None and self.config.workers > 1:
+                name = f'{self.config.name}-{index}'
+            yield threading.Thread(
+                target=self.thread_main,
+                daemon=True,
+                name=name,
+            )
 
     async def main(self):
-        thread = threading.Thread(
-            target=self.thread_main,
-            daemon=True,
-            name=self.config.name,
-        )
-        thread.start()
+        if self.config.workers < 1:
+            raise ActorOptionValueError('workers', self.config.workers)
+        threads = list(self.threads())
+        for thread in threads:
+            thread.start()
         tasks = []
         if self.getter is not None:
-            tasks.append(
-                self.mover(
-                    self.receive,
-                    self.q2t.async_q.put,
-                ),
-            )
+            tasks.append(self.feed())
         if self.putter is not None:
-            tasks.append(
-                self.mover(
-                    self.t2q.async_q.get,
-                    self.send,
-                ),
-            )
-        await asyncio.gather(*tasks)
-        self.q2t.close()
-        self.t2q.close()
-        thread.join()
+            tasks.append(self.drain())
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            self.q2t.close()
+            self.t2q.close()
+        loop = asyncio.get_running_loop()
+        for thread in threads:
+            await loop.run_in_executor(None, thread.join)
 
     def start(self):
-        self.q2t = janus.Queue(maxsize=1)
-        self.t2q = janus.Queue(maxsize=1)
+        self.q2t = Channel(self.config.capacity)
+        self.t2q = Channel(self.config.capacity)
         return super().start()
@@ -0,0 +1,260 @@
+"""Sampled per-event tracing of flows.
+
+Every `every`-th event produced by the source of instrumented flow is
+wrapped into envelope carrying its trace. Channels stamp the envelope
+on put and unwrap it on get, so actors never see it. When traced event
+reaches the sink its end to end latency and per hop breakdown are
+added to histograms.
+
+Traces of events received by an actor wait in its queue keyed by index
+of event among received ones until the actor sends event produced from
+it. Applicators (and Fused actors) executing function inline report
+index of event they process, so filtering is traced precisely. Other
+actors are supposed to send one event per received one (e.g. Tee),
+their n-th sent event is produced from n-th received one. Traces of
+events consumed into batches are kept only for event completing batch.
+"""
+import bisect
+import collections
+import dataclasses
+import time
+
+from .channels import ChannelMixinError, mixed_with
+from .core import DATA_FINISH_MARKER
+from .simple import Applicator, Fused
+
+
+class Histogram:
+    """Histogram of latencies with exponential buckets."""
+
+    def __init__(self, start=1e-6, factor=2, size=24):
+        self.bounds = [start * factor ** x for x in range(size)]
+        self.counts = [0] * (size + 1)
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def add(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q):
+        """Returns upper bound of bucket containing quantile."""
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if count and seen >= rank:
+                return bound
+        return self.max
+
+    def snapshot(self):
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0,
+            'p50': self.quantile(0.5),
+            'p99': self.quantile(0.99),
+            'max': self.max,
+            'buckets': [
+                (bound, count)
+                for bound, count in zip((*self.bounds, float('inf')), self.counts)
+                if count
+            ],
+        }
+
+
+@dataclasses.dataclass
+class Trace:
+    """Timestamps of traced event."""
+
+    started: float
+    stamped: float
+    hops: list = dataclasses.field(default_factory=list)
+
+    def hop(self, name, now):
+        self.hops.append((name, now - self.stamped))
+        self.stamped = now
+
+
+class Envelope:
+    """Traced event in channel."""
+
+    __slots__ = ('data', 'trace')
+
+    def __init__(self, data, trace):
+        self.data = data
+        self.trace = trace
+
+
+class Traced:
+    """Channel mixin wrapping and unwrapping traced events."""
+
+    tracer = None
+    stage: int = None
+    '''Index of actor sending events into channel.'''
+
+    def put_nowait(self, item):
+        if item is not DATA_FINISH_MARKER:
+            item = self.tracer.enter(self.stage, item)
+        super().put_nowait(item)
+
+    def get_nowait(self):
+        item = super().get_nowait()
+        return self.tracer.exit(self.stage + 1, item)
+
+
+TRACED_CHANNELS = {}
+
+
+def traced(channel, tracer, stage):
+    """Returns channel factory producing traced channels."""
+    def factory(capacity):
+        queue = channel(capacity)
+        cls = type(queue)
+        if cls not in TRACED_CHANNELS:
+            TRACED_CHANNELS[cls] = type(cls.__name__, (Traced, cls), {})
+        queue.__class__ = TRACED_CHANNELS[cls]
+        queue.tracer = tracer
+        queue.stage = stage
+        return queue
+    factory.mixin = Traced
+    factory.wrapped = channel
+    return factory
+
+
+class Tracer:
+    """Sampling tracer of events of instrumented flow."""
+
+    def __init__(self, every=100):
+        self.every = every
+        self.counter = 0
+        self.names = []
+        self.pending = []
+        '''Queues of `(index, trace)` of events received by actors.'''
+
+        self.received = []
+        self.sent = []
+        self.processed = []
+        '''Indexes of events processed by inline functions of actors.'''
+
+        self.latency = Histogram()
+        self.hops = {}
+
+    @staticmethod
+    def applicator(actor):
+        """Returns applicator executing function on received events inline."""
+        if isinstance(actor, Fused):
+            return actor.config.stages[0]
+        if isinstance(actor, Applicator) and not (
+            actor.config.thread
+            or actor.config.process
+            or actor.config.concurrency > 1
+        ):
+            return actor
+        return None
+
+    def follow(self, applicator, stage):
+        """Wraps function of applicator to track index of processed event."""
+        func = applicator.func
+
+        def wrapper(data):
+            self.processed[stage] += 1
+            return func(data)
+
+        applicator.func = wrapper
+        self.processed[stage] = -1
+
+    def instrument(self, flow):
+        """Replaces channels of flow edges with traced ones.
+
+        Should be called after flow configuration because actors options
+        are checked to track events processed by applicators.
+
+        Raises:
+            ChannelMixinError: if flow is already traced.
+        """
+        actors, joints = flow.plan()
+        for connector, *_ in joints:
+            if mixed_with(connector.config.channel, Traced):
+                raise ChannelMixinError(Traced)
+        self.names = [f'{actor!r}[{index}]' for index, actor in enumerate(actors)]
+        self.pending = [collections.deque() for _ in actors]
+        self.received = [0] * len(actors)
+        self.sent = [0] * len(actors)
+        self.processed = [None] * len(actors)
+        for stage, actor in enumerate(actors[1:], 1):
+            applicator = self.applicator(actor)
+            if applicator is not None:
+                self.follow(applicator, stage)
+        for connector, _, mid, _ in joints:
+            connector.config.channel = traced(
+                connector.config.channel,
+                self,
+                mid - 1,
+            )
+        return flow
+
+    def enter(self, stage, data):
+        if not stage:
+            # only source starts traces
+            self.counter += 1
+            if self.counter % self.every:
+                return data
+            now = time.perf_counter()
+            return Envelope(data, Trace(now, now))
+        index = self.processed[stage]
+        if index is None:
+            index = self.sent[stage]
+        self.sent[stage] += 1
+        pending = self.pending[stage]
+        # traces of earlier events did not pass through the actor
+        while pending and pending[0][0] < index:
+            pending.popleft()
+        if not pending or pending[0][0] != index:
+            return data
+        _, trace = pending.popleft()
+        trace.hop(self.names[stage], time.perf_counter())
+        return Envelope(data, trace)
+
+    def exit(self, stage, item):
+        if item is DATA_FINISH_MARKER:
+            return item
+        index = self.received[stage]
+        self.received[stage] += 1
+        if type(item) is not Envelope:
+            return item
+        trace = item.trace
+        now = time.perf_counter()
+        trace.hop(f'{self.names[stage - 1]} >> {self.names[stage]}', now)
+        if stage == len(self.names) - 1:
+            self.finish(trace, now)
+        else:
+            self.pending[stage].append((index, trace))
+        return item.data
+
+    def finish(self, trace, now):
+        self.latency.add(now - trace.started)
+        for name, value in trace.hops:
+            if name not in self.hops:
+                self.hops[name] = Histogram()
+            self.hops[name].add(value)
+
+    def snapshot(self):
+        """Returns end to end and per hop latency histograms."""
+        return {
+            'latency': self.latency.snapshot(),
+            'hops': {
+                name: histogram.snapshot()
+                for name, histogram in self.hops.items()
+            },
+        }
+
+
+def trace(flow, tracer=None):
+    """Instruments flow and returns its tracer."""
+    tracer = tracer or Tracer()
+    tracer.instrument(flow)
+    return tracer
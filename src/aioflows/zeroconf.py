@@ -1,34 +1,140 @@
-import zeroconf
+import asyncio
+import dataclasses
+from typing import Optional
 
-from .core import Source
-from .thread import Thread
+from zeroconf import ServiceStateChange
+from zeroconf.asyncio import (
+    AsyncServiceBrowser,
+    AsyncServiceInfo,
+    AsyncZeroconf,
+)
 
+from .core import Actor, Source
 
-class Listener(Source):
-    def __init__(self, putter):
-        super().__init__()
-        self.putter = putter
 
-    def remove_service(self, zeroconf, type, name):
-        self.send(('remove', (zeroconf, type, name)))
+ZEROCONF_ACTIONS = {
+    ServiceStateChange.Added: 'add',
+    ServiceStateChange.Updated: 'update',
+    ServiceStateChange.Removed: 'remove',
+}
 
-    def add_service(self, zeroconf, type, name):
-        self.send(('add', (zeroconf, type, name)))
 
+class Zeroconf(Source, Actor):
+    """Source actor discovering services with zeroconf.
 
-class Zeroconf(Thread):
-    def __init__(self, service_type):
-        super().__init__(self)
-        self.service_type = service_type
+    Browser runs on the event loop and every discovered service is
+    resolved concurrently, so events are `(action, info)` pairs with
+    already resolved addresses, port and properties. Resolved infos are
+    cached for `ttl` seconds and `lookup` of cached service is free.
+    """
 
-    def __call__(self, getter, putter):
-        zc = zeroconf.Zeroconf()
-        try:
-            browser = zeroconf.ServiceBrowser(
-                zc,
-                self.service_type,
-                Listener(putter),
+    @dataclasses.dataclass
+    class Options:
+        service_type: str = None
+        '''Type of services to browse, e.g. `_http._tcp.local.`.'''
+
+        ttl: float = 60
+        '''Time in seconds resolved service info is cached.'''
+
+        timeout: float = 3
+        '''Service info resolution timeout in seconds.'''
+
+    @dataclasses.dataclass
+    class Arguments(Options):
+        zeroconf: Optional[AsyncZeroconf] = None
+        '''Zeroconf instance to be used, created by actor if not set.'''
+
+    zeroconf: AsyncZeroconf = None
+    cache: dict = None
+    resolving: dict = None
+
+    async def resolve(self, service_type, name):
+        info = AsyncServiceInfo(service_type, name)
+        if await info.async_request(
+            self.zeroconf.zeroconf,
+            self.config.timeout * 1000,
+        ):
+            loop = asyncio.get_running_loop()
+            self.cache[name] = loop.time() + self.config.ttl, info
+            return info
+        self.cache.pop(name, None)
+        return None
+
+    async def lookup(self, service_type, name, fresh=False):
+        """Returns resolved service info (None if it is not resolved).
+
+        Cached info is returned while it is not expired and concurrent
+        lookups of the same service share one request.
+        """
+        loop = asyncio.get_running_loop()
+        deadline, info = self.cache.get(name, (0, None))
+        if not fresh and deadline > loop.time():
+            return info
+        if name not in self.resolving:
+            self.resolving[name] = asyncio.ensure_future(
+                self.resolve(service_type, name),
             )
-            browser.join()
+            self.resolving[name].add_done_callback(
+                lambda _: self.resolving.pop(name, None),
+            )
+        return await asyncio.shield(self.resolving[name])
+
+    async def report(self, action, service_type, name):
+        info = await self.lookup(
+            service_type,
+            name,
+            fresh=action == 'update',
+        )
+        # service could be removed while it was resolved
+        _, cached = self.cache.get(name, (0, None))
+        if info is not None and info is cached:
+            await self.send((action, info))
+
+    async def main(self):
+        self.zeroconf = self.config.zeroconf or AsyncZeroconf()
+        self.cache = {}
+        self.resolving = {}
+        changes = asyncio.Queue()
+        tasks = {}
+
+        def handler(zeroconf, service_type, name, state_change):
+            changes.put_nowait((state_change, service_type, name))
+
+        def done(task):
+            tasks.pop(task, None)
+            if not task.cancelled() and task.exception() is not None:
+                changes.put_nowait(task)
+
+        browser = AsyncServiceBrowser(
+            self.zeroconf.zeroconf,
+            self.config.service_type,
+            handlers=[handler],
+        )
+        try:
+            while True:
+                change = await changes.get()
+                if isinstance(change, asyncio.Future):
+                    change.result()
+                state_change, service_type, name = change
+                action = ZEROCONF_ACTIONS[state_change]
+                if action == 'remove':
+                    for task, service in list(tasks.items()):
+                        if service == name:
+                            task.cancel()
+                    if name in self.resolving:
+                        self.resolving[name].cancel()
+                    _, info = self.cache.pop(name, (0, None))
+                    if info is not None:
+                        await self.send((action, info))
+                    continue
+                task = asyncio.ensure_future(
+                    self.report(action, service_type, name),
+                )
+                tasks[task] = name
+                task.add_done_callback(done)
         finally:
-            zc.close()
+            for task in (*tasks, *self.resolving.values()):
+                task.cancel()
+            await browser.async_cancel()
+            if self.config.zeroconf is None:
+                await self.zeroconf.async_close()
@@ -14,8 +14,7 @@ from aioflows.zeroconf import Zeroconf
 
 
 def zc_station_info(data):
-    action, (zc, type, name) = data
-    info = zc.get_service_info(type, name)
+    action, info = data
     return (
         tuple(
             (host, info.port)
@@ -104,7 +103,7 @@ async def start(local_token=None):
     if local_token is None:
         raise RuntimeError('please provide yandex token')
     flow = (
-        Zeroconf('_yandexio._tcp.local.')
+        Zeroconf(service_type='_yandexio._tcp.local.')
         >> Tee(Printer())
         >> Applicator(zc_station_info)
         >> Applicator(lambda x: device_token(local_token, x), thread=True)
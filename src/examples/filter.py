@@ -0,0 +1,16 @@
+import asyncio
+
+from aioflows.simple import Applicator
+from aioflows.stdio import Stdin, Stdout
+
+
+async def start():
+    flow = (
+        Stdin()
+        >> Applicator(func=str.upper)
+        >> Stdout()
+    )
+    await flow.start()
+
+
+asyncio.run(start())
@@ -0,0 +1,46 @@
+import asyncio
+import time
+
+from aioflows.core import DATA_FINISH_MARKER, receiver
+
+
+COUNT = 200000
+
+
+async def legacy_receiver(receive):
+    while True:
+        data = receive()
+        if asyncio.iscoroutine(data):
+            data = asyncio.ensure_future(data)
+        if asyncio.isfuture(data):
+            data = await data
+        if data == DATA_FINISH_MARKER:
+            break
+        yield data
+
+
+async def produce(queue):
+    for x in range(COUNT):
+        await queue.put(x)
+    await queue.put(DATA_FINISH_MARKER)
+
+
+async def measure(receiver, capacity):
+    queue = asyncio.Queue(capacity)
+    producer = asyncio.ensure_future(produce(queue))
+    start = time.perf_counter()
+    async for _ in receiver(queue.get):
+        pass
+    elapsed = time.perf_counter() - start
+    await producer
+    return COUNT / elapsed
+
+
+async def start():
+    for capacity in (1, 1024):
+        for name, func in (('legacy', legacy_receiver), ('fast', receiver)):
+            rate = await measure(func, capacity)
+            print(f'capacity={capacity} {name}: {rate:,.0f} msg/s')
+
+
+asyncio.run(start())
@@ -0,0 +1,27 @@
+import pytest
+
+from aioflows.bench import SCENARIOS, run
+
+
+@pytest.mark.asyncio
+async def test_bench():
+    reports = await run(count=100)
+
+    assert [x['scenario'] for x in reports] == list(SCENARIOS)
+    for report in reports:
+        assert report['events'] == 100
+        assert 0 < report['received'] <= 100
+        assert report['throughput'] > 0
+        assert 0 <= report['p50'] <= report['p99']
+        assert report['peak_rss'] > 0
+
+
+@pytest.mark.asyncio
+async def test_bench_params():
+    reports = await run(['chain', 'tee', 'udp'], count=10, depth=2, size=5)
+
+    assert [x['params'] for x in reports] == [
+        {'depth': 2},
+        {'branches': 4},
+        {},
+    ]
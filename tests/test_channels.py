@@ -0,0 +1,117 @@
+import asyncio
+import io
+
+import pytest
+
+from aioflows.channels import DropNewestQueue, DropOldestQueue
+from aioflows.core import DATA_FINISH_MARKER, receive_many, receiver, send_many
+from aioflows.simple import List, Printer
+
+
+@pytest.mark.asyncio
+async def test_drop_newest_queue():
+    queue = DropNewestQueue(2)
+    for x in range(4):
+        await queue.put(x)
+    assert queue.dropped == 2
+    assert [queue.get_nowait() for _ in range(2)] == [0, 1]
+
+
+@pytest.mark.asyncio
+async def test_drop_newest_queue_keeps_finish_marker():
+    queue = DropNewestQueue(1)
+    await queue.put(0)
+    put = asyncio.ensure_future(queue.put(DATA_FINISH_MARKER))
+    await asyncio.sleep(0)
+    assert not put.done()
+    assert await queue.get() == 0
+    await put
+    assert await queue.get() is DATA_FINISH_MARKER
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_queue():
+    queue = DropOldestQueue(2)
+    for x in range(4):
+        await queue.put(x)
+    assert queue.dropped == 2
+    assert [queue.get_nowait() for _ in range(2)] == [2, 3]
+
+
+@pytest.mark.asyncio
+async def test_connect_unbounded(helpers):
+    stream = io.StringIO()
+    source = List(data=[0, 1, 2])
+
+    pipeline = source.connect(Printer(stream=stream), capacity=None)
+    await helpers.execute(pipeline)
+
+    assert stream.getvalue() == '0\n1\n2\n'
+
+
+@pytest.mark.asyncio
+async def test_connect_drop_oldest(helpers):
+    stream = io.StringIO()
+    source = List(data=[0, 1, 2, 3, 4])
+
+    pipeline = source.connect(
+        Printer(stream=stream),
+        capacity=2,
+        channel=DropOldestQueue,
+    )
+    await helpers.execute(pipeline)
+
+    assert stream.getvalue() == '4\n'
+
+
+@pytest.mark.asyncio
+async def test_send_receive_many():
+    queue = asyncio.Queue(4)
+    await send_many(queue.put, [0, 1, 2, DATA_FINISH_MARKER])
+    assert queue.full()
+    assert await receive_many(queue.get, 2) == [0, 1]
+    assert await receive_many(queue.get) == [2, DATA_FINISH_MARKER]
+
+
+@pytest.mark.asyncio
+async def test_send_many_blocks_on_full_queue():
+    queue = asyncio.Queue(1)
+    send = asyncio.ensure_future(send_many(queue.put, [0, 1]))
+    await asyncio.sleep(0)
+    assert not send.done()
+    data = await receive_many(queue.get)
+    await send
+    while queue.qsize():
+        data += await receive_many(queue.get)
+    assert data == [0, 1]
+
+
+@pytest.mark.asyncio
+async def test_receiver_chunks():
+    queue = asyncio.Queue()
+    await send_many(queue.put, [0, 1, 2, DATA_FINISH_MARKER, 3])
+    chunks = [x async for x in receiver(queue.get, chunk=2)]
+    assert chunks == [[0, 1], [2]]
+
+
+@pytest.mark.asyncio
+async def test_receiver_chunks_fallback():
+    data = iter([0, 1, DATA_FINISH_MARKER])
+    chunks = [x async for x in receiver(lambda: next(data), chunk=2)]
+    assert chunks == [[0], [1]]
+
+
+class Incomparable:
+    def __eq__(self, other):
+        raise TypeError('comparison is not supported')
+
+
+@pytest.mark.asyncio
+async def test_receiver_compares_marker_by_identity():
+    queue = asyncio.Queue()
+    data = [Incomparable(), Incomparable()]
+    await send_many(queue.put, [*data, DATA_FINISH_MARKER])
+    assert [x async for x in receiver(queue.get)] == data
+
+    values = iter([*data, DATA_FINISH_MARKER])
+    assert [x async for x in receiver(lambda: next(values))] == data
@@ -1,4 +1,6 @@
-from aioflows.simple import Counter, List, Logger, Null, Ticker
+from aioflows.simple import Counter, List, Logger, Null, Tee, Ticker
+from aioflows.stdio import Stdin
+from aioflows.thread import Thread
 
 
 def test_options_null():
@@ -34,3 +36,23 @@ def test_options_configure():
     assert props['limit']['default'] == 100
     props = options[1]['properties']
     assert props['logger']['default'] == 'test'
+
+
+def test_options_configure_tee():
+    # side branches options are arguments and do not shift flow options
+    flow = List() >> Tee(sink=Null(), policy='drop') >> Logger() >> Null()
+    flow.configure([{'data': [1]}, {'logger': 'test'}])
+    props = [[*o['properties'].keys()] for o in flow.options]
+    assert props == [['data'], ['logger', 'level']]
+    assert flow.options[1]['properties']['logger']['default'] == 'test'
+
+
+def test_options_configure_thread():
+    flow = List() >> Thread(func=None, workers=2) >> Logger() >> Null()
+    flow.configure([{'data': [1]}, {'logger': 'test'}])
+    assert len(flow.options) == 2
+    assert flow.options[1]['properties']['logger']['default'] == 'test'
+
+
+def test_options_stdin():
+    assert Stdin().options == ()
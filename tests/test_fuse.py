@@ -0,0 +1,99 @@
+import io
+
+import pytest
+
+from aioflows.simple import (
+    Applicator,
+    Batcher,
+    Counter,
+    Filter,
+    Fused,
+    List,
+    Printer,
+    Take,
+    Ticker,
+    fuse,
+)
+
+
+def test_fuse_plan():
+    flow = fuse(
+        Ticker()
+        >> Counter()
+        >> Filter(func=lambda x: x % 2)
+        >> Applicator(func=lambda x: x * 2, thread=True)
+        >> Applicator(func=lambda x: x * 2)
+        >> Take(limit=2)
+        >> Printer()
+    )
+    actors, _ = flow.plan()
+    assert [type(x) for x in actors] == [
+        Ticker,
+        Counter,
+        Filter,
+        Applicator,
+        Fused,
+        Printer,
+    ]
+
+
+def test_fuse_nothing():
+    flow = List() >> Applicator(func=str) >> Printer()
+    assert fuse(flow) is flow
+
+
+def test_fuse_widened():
+    flow = (
+        List()
+        >> Applicator(func=str)
+    ).connect(Applicator(func=int), capacity=1000) >> Printer()
+    assert fuse(flow) is flow
+
+
+def test_fuse_options():
+    flow = fuse(
+        List()
+        >> Applicator(func=str)
+        >> Take(limit=1)
+        >> Printer()
+    )
+    assert len(flow.options) == 3
+    flow.configure([{'data': [0]}, {'thread': False}, {'limit': 5}])
+    props = flow.options[2]['properties']
+    assert props['limit']['default'] == 5
+
+
+@pytest.mark.asyncio
+async def test_fused_flow(helpers):
+    def generate(x):
+        for i in range(x):
+            yield i
+
+    stream = io.StringIO()
+    pipeline = fuse(
+        List(data=[1, 2, 3, 4])
+        >> Filter(func=lambda x: x > 1)
+        >> Applicator(func=generate)
+        >> Batcher(size=2)
+        >> Applicator(func=sum)
+        >> Printer(stream=stream)
+    )
+    await helpers.execute(pipeline)
+
+    assert stream.getvalue() == '1\n1\n2\n3\n3\n'
+
+
+@pytest.mark.asyncio
+async def test_fused_take(helpers):
+    stream = io.StringIO()
+    pipeline = fuse(
+        List(data=[1, 2, 3, 4, 5])
+        >> Applicator(func=lambda x: x * 2)
+        >> Batcher(size=2)
+        >> Take(limit=2)
+        >> Batcher(size=3)
+        >> Printer(stream=stream)
+    )
+    await helpers.execute(pipeline)
+
+    assert stream.getvalue() == '[[2, 4], [6, 8]]\n'
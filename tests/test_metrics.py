@@ -0,0 +1,107 @@
+import asyncio
+import time
+
+import pytest
+
+from aioflows.channels import ChannelMixinError, DropOldestQueue
+from aioflows.metrics import Exporter, Metrics, instrument, prometheus
+from aioflows.simple import Applicator, Consumer, List, Null, Take, Ticker
+
+
+def slow(data):
+    time.sleep(0.005)
+    return data
+
+
+@pytest.mark.asyncio
+async def test_metrics(helpers):
+    result = []
+    pipeline = (
+        List(data=range(10))
+        >> Applicator(func=slow)
+        >> Consumer(func=result.append)
+    )
+    metrics = instrument(pipeline)
+    await helpers.execute(pipeline)
+    snapshot = metrics.snapshot()
+
+    assert list(snapshot['edges']) == [
+        'List[0] >> Applicator[1]',
+        'Applicator[1] >> Consumer[2]',
+    ]
+    assert result == list(range(10))
+    edges = list(snapshot['edges'].values())
+    assert [x['events'] for x in edges] == [10, 10]
+    assert edges[0]['put_wait'] > 0
+    assert edges[1]['get_wait'] > 0
+    assert [x['depth_max'] for x in edges] == [1, 1]
+
+    actors = snapshot['actors']
+    assert list(actors) == ['List[0]', 'Applicator[1]', 'Consumer[2]']
+    assert actors['Applicator[1]']['events'] == 10
+    assert 0.005 <= actors['Applicator[1]']['per_event'] < 0.01
+    assert actors['Consumer[2]']['processing'] < 0.005
+    # source receives no events
+    assert actors['List[0]']['processing'] == 0
+
+
+@pytest.mark.asyncio
+async def test_metrics_processing(helpers):
+    # sleeps of source and blocking on channels are not processing, but
+    # waits of actors for executor and their own sleeps are
+    pipeline = (
+        Ticker(timeout=0.005, limit=10)
+        >> Applicator(func=slow, thread=True)
+        >> Consumer(func=lambda x: asyncio.sleep(0.002))
+    )
+    metrics = instrument(pipeline)
+    await helpers.execute(pipeline)
+    actors = metrics.snapshot()['actors']
+
+    assert actors['Ticker[0]']['processing'] == 0
+    assert 0.005 <= actors['Applicator[1]']['per_event'] < 0.01
+    assert 0.002 <= actors['Consumer[2]']['per_event'] < 0.005
+
+
+@pytest.mark.asyncio
+async def test_metrics_channel_type(helpers):
+    pipeline = List(data=range(10)).connect(
+        Consumer(func=lambda x: asyncio.sleep(0.001)),
+        capacity=4,
+        channel=DropOldestQueue,
+    )
+    metrics = Metrics()
+    metrics.instrument(pipeline)
+    await helpers.execute(pipeline)
+
+    edge, = metrics.edges.values()
+    assert isinstance(edge.channel, DropOldestQueue)
+    # finish marker pushes out one more event
+    assert edge.channel.dropped == 7
+    assert edge.depth_max == 4
+
+
+@pytest.mark.asyncio
+async def test_exporter(helpers):
+    pipeline = List(data=[1, 2]) >> Null()
+    metrics = instrument(pipeline)
+    await helpers.execute(pipeline)
+
+    result = []
+    exporter = (
+        Exporter(metrics=metrics, interval=0)
+        >= Take(limit=1)
+        >> Consumer(func=result.append)
+    )
+    await helpers.execute(exporter)
+
+    assert result == [prometheus(metrics.snapshot())]
+    assert 'aioflows_edge_events_total{edge="List[0] >> Null[1]"} 2\n' in result[0]
+    assert '# TYPE aioflows_actor_processing_seconds_total counter\n' in result[0]
+
+
+def test_metrics_twice():
+    pipeline = List() >> Null()
+    instrument(pipeline)
+    with pytest.raises(ChannelMixinError):
+        instrument(pipeline)
@@ -0,0 +1,186 @@
+import asyncio
+import contextlib
+import types
+
+import aiomqtt
+import pytest
+
+from aioflows.mqtt import Publisher, TopicRouter, TopicTrie
+from aioflows.simple import Branch, Consumer, List
+
+
+class FakeClient:
+    """In-process stand-in of aiomqtt.Client."""
+
+    def __init__(self, topics=(), latency=0, interval=None):
+        self.topics = list(topics)
+        self.interval = interval
+        self.subscriptions = []
+        self.latency = latency
+        self.published = []
+        self.inflight = 0
+        self.peak = 0
+
+    @contextlib.asynccontextmanager
+    async def messages(self):
+        yield self.iterate()
+
+    async def iterate(self):
+        for topic in self.topics:
+            if self.interval is not None:
+                await asyncio.sleep(self.interval)
+            yield types.SimpleNamespace(
+                topic=aiomqtt.Topic(topic),
+                payload=topic.encode(),
+            )
+
+    async def subscribe(self, topic):
+        self.subscriptions.append(topic)
+
+    async def publish(self, topic, payload, qos=0, retain=False):
+        self.inflight += 1
+        self.peak = max(self.peak, self.inflight)
+        try:
+            # broker acknowledgement
+            await asyncio.sleep(self.latency if qos else 0)
+        finally:
+            self.inflight -= 1
+        if payload == b'fail':
+            raise aiomqtt.MqttError('publish failed')
+        self.published.append((topic, bytes(payload)))
+
+
+@pytest.mark.parametrize('topic, expected', [
+    ('a/b/c', ['a/b/c', 'a/+/c', 'a/#', '#', '+/+/+']),
+    ('a', ['a/#', '#', 'a']),
+    ('b/c', ['#']),
+    ('$SYS/a', ['$SYS/#']),
+])
+def test_topic_trie(topic, expected):
+    trie = TopicTrie()
+    filters = ['a/b/c', 'a/+/c', 'a/#', '#', '+/+/+', 'a', '$SYS/#', 'a/b']
+    for value in filters:
+        trie.insert(value, value)
+    assert sorted(trie.match(topic)) == sorted(expected)
+
+
+@pytest.mark.asyncio
+async def test_topic_router(helpers):
+    client = FakeClient(['a/x', 'b/y', 'a/z', 'c', 'b/z'])
+    result = {'a': [], 'b': [], 'rest': []}
+    pipeline = TopicRouter(
+        client=client,
+        policy='block',
+        routes={
+            'a/+': Consumer(func=lambda x: result['a'].append(x.payload)),
+            'b/#': Consumer(func=lambda x: result['b'].append(x.payload)),
+        },
+    ) >> Consumer(func=lambda x: result['rest'].append(x.payload))
+    await helpers.execute(pipeline)
+
+    assert client.subscriptions == ['a/+', 'b/#']
+    assert result == {
+        'a': [b'a/x', b'a/z'],
+        'b': [b'b/y', b'b/z'],
+        'rest': [b'c'],
+    }
+
+
+@pytest.mark.asyncio
+async def test_topic_router_defaults(helpers):
+    client = FakeClient(['slow', 'fast'] * 5 + ['idle'], interval=0.001)
+    slow = []
+    fast = []
+
+    async def stall(x):
+        slow.append(x.payload)
+        await asyncio.sleep(10)
+
+    router = TopicRouter(
+        client=client,
+        routes={'slow': Consumer(func=stall), 'fast': Consumer(func=fast.append)},
+    )
+    task = asyncio.ensure_future(router.start())
+    await asyncio.sleep(0.1)
+
+    # slow branch does not block fast one, its latest message is pushed
+    # out of channel by finish marker
+    assert len(fast) == 5
+    assert slow == [b'slow']
+    assert router.queues[0].dropped == 4
+    assert not task.done()
+    await helpers.finalize()
+
+
+@pytest.mark.asyncio
+async def test_topic_router_slow_branch(helpers):
+    client = FakeClient(['slow'] * 5 + ['fast'] * 5)
+    fast = []
+    router = TopicRouter(
+        client=client,
+        subscribe=False,
+        policy='block',
+        routes={
+            'slow': Branch(
+                sink=Consumer(func=lambda x: asyncio.sleep(10)),
+                policy='drop',
+            ),
+            'fast': Consumer(func=fast.append),
+        },
+    )
+    task = asyncio.ensure_future(router.start())
+    await asyncio.sleep(0.05)
+
+    assert len(fast) == 5
+    assert 3 <= router.queues[0].dropped <= 4
+    assert not client.subscriptions
+    assert not task.done()
+    await helpers.finalize()
+
+
+@pytest.mark.asyncio
+async def test_publisher_inflight(helpers):
+    client = FakeClient(latency=0.01)
+    pipeline = (
+        List(data=[b'%d' % x for x in range(20)])
+        >> Publisher(client=client, topic='t', qos=1, inflight=4)
+    )
+    await helpers.execute(pipeline)
+
+    assert sorted(client.published) == sorted(
+        ('t', b'%d' % x) for x in range(20)
+    )
+    assert client.peak == 4
+
+
+@pytest.mark.asyncio
+async def test_publisher_coalesce(helpers):
+    client = FakeClient()
+    pipeline = (
+        List(data=[
+            ('a', b'1'),
+            ('a', b'2'),
+            ('b', b'3'),
+            ('b', b'4444'),
+            ('a', b'5'),
+        ]).connect(Publisher(client=client, coalesce=4), capacity=None)
+    )
+    await helpers.execute(pipeline)
+
+    assert client.published == [
+        ('a', b'1\n2'),
+        ('b', b'3'),
+        ('b', b'4444'),
+        ('a', b'5'),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_publisher_error(helpers):
+    client = FakeClient()
+    pipeline = (
+        List(data=[b'ok', b'fail', b'ok'])
+        >> Publisher(client=client, topic='t', inflight=1)
+    )
+    with pytest.raises(aiomqtt.MqttError):
+        await helpers.execute(pipeline)
@@ -0,0 +1,308 @@
+import asyncio
+import socket
+from unittest import mock
+
+import pytest
+
+from aioflows.core import DATA_FINISH_MARKER
+from aioflows.network import (
+    BufferedStream,
+    BufferPool,
+    LengthFraming,
+    LineFraming,
+    TcpClient,
+    TcpServer,
+    Udp,
+    UnixClient,
+    UnixServer,
+)
+from aioflows.simple import Applicator, Consumer, List, Take, Ticker, Unbatch
+
+
+@pytest.fixture
+def sock():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(('127.0.0.1', 0))
+    yield sock
+    sock.close()
+
+
+def send(addr, count):
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        for x in range(count):
+            sock.sendto(b'%d' % x, addr)
+
+
+@pytest.mark.asyncio
+async def test_udp_burst(helpers, sock):
+    result = []
+    udp = Udp(options=dict(sock=sock), capacity=16)
+    pipeline = (
+        udp
+        >= Take(limit=10)
+        >> Consumer(func=lambda x: result.append(x[0]))
+    )
+    task = asyncio.ensure_future(pipeline.start())
+    await asyncio.sleep(0.01)
+    send(sock.getsockname(), 11)
+    await asyncio.wait_for(task, 1)
+
+    assert result == [b'%d' % x for x in range(10)]
+    assert udp.dropped == 0
+
+
+@pytest.mark.asyncio
+async def test_udp_overflow(helpers, sock):
+    udp = Udp(options=dict(sock=sock))
+    pipeline = udp >> Consumer(func=lambda x: asyncio.sleep(10))
+    task = asyncio.ensure_future(pipeline.start())
+    await asyncio.sleep(0.01)
+    send(sock.getsockname(), 10)
+    await asyncio.sleep(0.05)
+
+    assert not task.done()
+    assert 0 < udp.dropped < 10
+    await helpers.finalize()
+
+
+@pytest.mark.asyncio
+async def test_udp_bulk(helpers, sock):
+    batches = []
+    result = []
+
+    def consume(batch):
+        batches.append(len(batch))
+        return batch
+
+    pipeline = (
+        Udp(options=dict(sock=sock), bulk=4, size=16)
+        >> Applicator(func=consume)
+        >> Unbatch()
+        >= Take(limit=10)
+        >> Consumer(func=lambda x: result.append(bytes(x[0])))
+    )
+    task = asyncio.ensure_future(pipeline.start())
+    await asyncio.sleep(0.01)
+    send(sock.getsockname(), 11)
+    await asyncio.wait_for(task, 1)
+
+    assert result == [b'%d' % x for x in range(10)]
+    assert max(batches) == 4
+
+
+def test_buffer_pool():
+    pool = BufferPool(8, limit=1)
+    buffer = pool.acquire()
+    view = memoryview(buffer)[:4]
+    assert pool.acquire() is not buffer
+    view.release()
+    assert pool.acquire() is buffer
+    assert len(buffer) == 8
+
+
+@pytest.mark.asyncio
+async def test_udp_echo(helpers, sock):
+    udp = Udp(options=dict(sock=sock))
+    pipeline = udp >> Applicator(func=lambda x: (x[0][::-1], x[1])) >> udp
+    task = asyncio.ensure_future(pipeline.start())
+    await asyncio.sleep(0.01)
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as client:
+        client.settimeout(1)
+        client.sendto(b'abc', sock.getsockname())
+        data = await asyncio.get_running_loop().run_in_executor(
+            None,
+            client.recv,
+            16,
+        )
+
+    assert data == b'cba'
+    assert not task.done()
+    await helpers.finalize()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('bulk', [None, 8])
+async def test_udp_batch_coalesce(helpers, sock, bulk):
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as client:
+        client.bind(('127.0.0.1', 0))
+        client.settimeout(1)
+        addr = client.getsockname()
+        pipeline = (
+            List(data=[
+                [(b'a', addr), (b'b', addr)],
+                (b'c', addr),
+                [(b'ddd', addr), (b'e', addr)],
+            ]).connect(
+                Udp(options=dict(sock=sock), coalesce=5, bulk=bulk),
+                capacity=None,
+            )
+        )
+        await helpers.execute(pipeline)
+        loop = asyncio.get_running_loop()
+        result = [
+            await loop.run_in_executor(None, client.recv, 16)
+            for _ in range(2)
+        ]
+
+    assert result == [b'a\nb\nc', b'ddd\ne']
+
+
+@pytest.mark.asyncio
+async def test_udp_write_pause(helpers, sock):
+    udp = Udp(options=dict(sock=sock), high=1024, low=0)
+    addr = sock.getsockname()
+    pipeline = (
+        Ticker(timeout=0.02, limit=2)
+        >> Applicator(func=lambda x: (b'a', addr))
+        >> udp
+    )
+    task = asyncio.ensure_future(pipeline.start())
+    await asyncio.sleep(0.01)
+    udp.pause_writing()
+    await asyncio.sleep(0.05)
+
+    assert udp.options[0]['properties']['high']['default'] == 1024
+    assert not task.done()
+    udp.resume_writing()
+    await asyncio.wait_for(task, 1)
+
+
+@pytest.mark.asyncio
+async def test_tcp_echo(helpers):
+    server = TcpServer(
+        host='127.0.0.1',
+        port=0,
+        framing=LengthFraming(),
+        handler=lambda: Applicator(func=bytes.upper),
+    )
+    task = asyncio.ensure_future(server.start())
+    await asyncio.sleep(0.01)
+    _, port = server.server.sockets[0].getsockname()
+
+    result = []
+    pipeline = (
+        List(data=[b'a', b'b\nc', b''])
+        >> TcpClient(host='127.0.0.1', port=port, framing=LengthFraming())
+        >> Consumer(func=result.append)
+    )
+    await asyncio.wait_for(pipeline.start(), 1)
+
+    assert result == [b'A', b'B\nC', b'']
+    assert not task.done()
+    await helpers.finalize()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('framing', [LengthFraming(), LineFraming()])
+async def test_tcp_buffered(helpers, framing):
+    server = TcpServer(
+        host='127.0.0.1',
+        port=0,
+        framing=framing,
+        buffer=16,
+        handler=lambda: Applicator(func=bytes),
+    )
+    task = asyncio.ensure_future(server.start())
+    await asyncio.sleep(0.01)
+    _, port = server.server.sockets[0].getsockname()
+
+    # frames are larger than buffers of both sides
+    data = [b'a', b'x' * 100, b'b', b'y' * 20, b'c']
+    result = []
+    pipeline = (
+        List(data=data)
+        >> TcpClient(host='127.0.0.1', port=port, framing=framing, buffer=16)
+        >> Consumer(func=lambda x: result.append(bytes(x)))
+    )
+    await asyncio.wait_for(pipeline.start(), 1)
+
+    assert result == data
+    assert not task.done()
+    await helpers.finalize()
+
+
+@pytest.mark.asyncio
+async def test_buffered_stream():
+    stream = BufferedStream(LineFraming(), 8)
+    stream.connection_made(mock.Mock())
+
+    def feed(data):
+        buffer = stream.get_buffer(-1)
+        buffer[:len(data)] = data
+        stream.buffer_updated(len(data))
+
+    feed(b'ab\ncdef')
+    first = stream.buffer
+    frame = await stream.get()
+    assert frame == b'ab' and frame.obj is first
+
+    # tail of incomplete frame is moved to free buffer
+    feed(b'g\n')
+    assert stream.buffer is not first
+    assert await stream.get() == b'cdefg'
+
+    # buffer is reused after its frames are released
+    frame.release()
+    feed(b'h')
+    feed(b'ij')
+    assert stream.buffer is first
+    stream.eof_received()
+    assert await stream.get() == b'hij'
+    assert await stream.get() is DATA_FINISH_MARKER
+
+    # reading is paused while buffer is full
+    stream = BufferedStream(LineFraming(), 8)
+    stream.connection_made(mock.Mock())
+    feed(b'12345678')
+    stream.transport.pause_reading.assert_called_once_with()
+
+
+@pytest.mark.asyncio
+async def test_tcp_server_events(helpers):
+    result = []
+    server = TcpServer(host='127.0.0.1', port=0, max_connections=1)
+    pipeline = server >> Consumer(func=result.append)
+    task = asyncio.ensure_future(pipeline.start())
+    await asyncio.sleep(0.01)
+    addr = server.server.sockets[0].getsockname()
+
+    reader, writer = await asyncio.open_connection(*addr)
+    writer.write(b'a\nb\nc')
+    await writer.drain()
+    extra, _ = await asyncio.open_connection(*addr)
+    assert await extra.read() == b''
+    writer.close()
+    await asyncio.sleep(0.01)
+
+    peer = writer.get_extra_info('sockname')
+    assert result == [(b'a', peer), (b'b', peer), (b'c', peer)]
+    assert not task.done()
+    await helpers.finalize()
+
+
+@pytest.mark.asyncio
+async def test_unix_echo(helpers, tmp_path):
+    path = str(tmp_path / 'socket')
+    server = UnixServer(path=path, handler=lambda: Applicator(func=bytes))
+    task = asyncio.ensure_future(server.start())
+    await asyncio.sleep(0.01)
+
+    result = []
+    pipeline = (
+        List(data=[b'a', b'b'])
+        >> UnixClient(path=path)
+        >> Consumer(func=result.append)
+    )
+    await asyncio.wait_for(pipeline.start(), 1)
+
+    assert result == [b'a', b'b']
+    assert not task.done()
+    await helpers.finalize()
+
+
+def test_client_connect():
+    # edge configuration of clients is not shadowed by their connection
+    flow = TcpClient(host='127.0.0.1').connect(Consumer(), capacity=10)
+    assert flow.config.capacity == 10
+    flow = UnixClient(path='socket').connect(Consumer(), capacity=10)
+    assert flow.config.capacity == 10
@@ -0,0 +1,102 @@
+import asyncio
+import concurrent.futures
+import os
+
+import pytest
+
+from aioflows.core import DATA_FINISH_MARKER
+from aioflows.process import Process, ProcessWorkerError
+from aioflows.simple import Consumer, List
+
+
+def double(getter, putter):
+    while True:
+        data = getter.get_many()
+        putter.put_many(
+            (x * 2, os.getpid())
+            for x in data
+            if x is not DATA_FINISH_MARKER
+        )
+        if data[-1] is DATA_FINISH_MARKER:
+            break
+    putter(DATA_FINISH_MARKER)
+
+
+def upper(getter, putter):
+    for data in iter(getter, DATA_FINISH_MARKER):
+        assert isinstance(data, memoryview)
+        putter(bytes(data).upper())
+        putter(data.tobytes() * 100)
+    putter(DATA_FINISH_MARKER)
+
+
+def echo(getter, putter):
+    for data in iter(getter, DATA_FINISH_MARKER):
+        putter(data)
+    putter(DATA_FINISH_MARKER)
+
+
+def fail(getter, putter):
+    getter()
+    raise ValueError('broken worker')
+
+
+def crash(getter, putter):
+    os._exit(3)
+
+
+@pytest.mark.asyncio
+async def test_process(helpers):
+    result = []
+    pipeline = (
+        List(data=range(100))
+        >> Process(func=double)
+        >> Consumer(func=result.append)
+    )
+    await helpers.execute(pipeline)
+
+    assert [x for x, _ in result] == [x * 2 for x in range(100)]
+    assert {pid for _, pid in result} != {os.getpid()}
+
+
+@pytest.mark.asyncio
+async def test_process_chain(helpers):
+    # transport threads do not exhaust default executor
+    loop = asyncio.get_running_loop()
+    with concurrent.futures.ThreadPoolExecutor(1) as executor:
+        loop.set_default_executor(executor)
+        result = []
+        pipeline = (
+            List(data=range(100))
+            >> Process(func=echo, capacity=4)
+            >> Process(func=echo, capacity=4)
+            >> Process(func=echo, capacity=4)
+            >> Consumer(func=result.append)
+        )
+        await helpers.execute(pipeline)
+
+    assert result == list(range(100))
+
+
+@pytest.mark.asyncio
+async def test_process_shared_memory(helpers):
+    result = []
+    pipeline = (
+        List(data=[b'%d' % x for x in range(50)])
+        >> Process(func=upper, shared=16, slots=4)
+        >> Consumer(func=result.append)
+    )
+    await helpers.execute(pipeline)
+
+    assert result[::2] == [b'%d' % x for x in range(50)]
+    assert result[-1] == b'49' * 100
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('func, message', [
+    (fail, 'broken worker'),
+    (crash, 'exit code 3'),
+])
+async def test_process_error(helpers, func, message):
+    with pytest.raises(ProcessWorkerError, match=message):
+        await helpers.execute(List(data=[1]) >> Process(func=func))
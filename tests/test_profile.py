@@ -0,0 +1,49 @@
+import re
+import time
+
+import pytest
+
+from aioflows.profile import profile
+from aioflows.simple import Applicator, Consumer, List
+
+
+def spin(data):
+    deadline = time.thread_time() + 0.005
+    while time.thread_time() < deadline:
+        pass
+    return data
+
+
+def sleep(data):
+    time.sleep(0.005)
+    return data
+
+
+@pytest.mark.asyncio
+async def test_profile(helpers):
+    result = []
+    pipeline = (
+        List(data=range(5))
+        >> Applicator(func=spin)
+        >> Applicator(func=sleep)
+        >> Consumer(func=result.append)
+    )
+    profiler = profile(pipeline)
+    await helpers.execute(pipeline)
+    snapshot = profiler.snapshot()
+
+    assert result == list(range(5))
+    root = 'List >> Applicator >> Applicator >> Consumer'
+    left = f'{root};List >> Applicator >> Applicator'
+    spinner = snapshot[f'{left};List >> Applicator;Applicator[1]']
+    sleeper = snapshot[f'{left};Applicator[2]']
+    consumer = snapshot[f'{root};Consumer[3]']
+    assert spinner['cpu'] >= 0.025
+    assert sleeper['blocked'] >= 0.02
+    assert sleeper['cpu'] < spinner['cpu']
+    assert consumer['await'] > consumer['cpu']
+    assert all(x['steps'] > 0 for x in snapshot.values())
+
+    lines = profiler.collapsed().splitlines()
+    assert all(re.fullmatch(r'[^ ]+(?: [^ ]+)*;(cpu|blocked|await) \d+', x) for x in lines)
+    assert any(x.startswith(f'{root};Consumer[3];await ') for x in lines)
@@ -1,6 +1,9 @@
 import asyncio
+import concurrent.futures
 import io
+import operator
 import threading
+import time
 
 import pytest
 
@@ -8,21 +11,29 @@ from aioflows.core import (
     DATA_FINISH_MARKER,
     Actor,
     ActorArgumentsError,
+    ActorOptionValueError,
     ActorSyntaxError,
 )
 from aioflows.simple import (
+    APPLICATOR_IGNORE,
     Applicator,
+    ApplicatorProcessError,
     Batcher,
+    Branch,
+    Consumer,
     Counter,
     Filter,
     List,
     Logger,
+    Merge,
     Null,
     Printer,
     Repeat,
+    Shard,
     Take,
     Tee,
     Ticker,
+    Unbatch,
 )
 from aioflows.thread import Thread
 
@@ -112,6 +123,91 @@ async def test_thread_printer(helpers):
     assert not [x for x in threading.enumerate() if x.name == 'ThreadActor']
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize('capacity', [1, 3, 1024])
+async def test_thread_bulk(helpers, capacity):
+    chunks = []
+
+    def func(getter, putter):
+        while True:
+            data = getter.get_many(2)
+            chunks.append(len(data))
+            putter.put_many(x for x in data if x != DATA_FINISH_MARKER)
+            if data[-1] == DATA_FINISH_MARKER:
+                break
+        putter(DATA_FINISH_MARKER)
+        putter('ignored')
+
+    result = []
+    pipeline = (
+        List(data=range(10))
+        >> Thread(func=func, capacity=capacity)
+        >> Consumer(func=result.append)
+    )
+    await helpers.execute(pipeline)
+
+    assert result == list(range(10))
+    assert max(chunks) <= 2
+
+
+@pytest.mark.asyncio
+async def test_thread_cancel_unblocks_thread(helpers):
+    finished = threading.Event()
+
+    def func(getter, _):
+        while getter() != DATA_FINISH_MARKER:
+            pass
+        finished.set()
+
+    pipeline = Ticker(timeout=10) >> Thread(func=func)
+    task = asyncio.ensure_future(pipeline.start())
+    await asyncio.sleep(0.01)
+    task.cancel()
+    await helpers.finalize()
+
+    assert await asyncio.get_running_loop().run_in_executor(
+        None,
+        finished.wait,
+        1,
+    )
+
+
+@pytest.mark.asyncio
+async def test_thread_workers(helpers):
+    lock = threading.Lock()
+    active = []
+    peak = []
+
+    def func(getter, putter):
+        for data in iter(getter, DATA_FINISH_MARKER):
+            with lock:
+                active.append(data)
+                peak.append(len(active))
+            time.sleep(0.02)
+            with lock:
+                active.remove(data)
+            putter(data)
+        putter(DATA_FINISH_MARKER)
+
+    result = []
+    pipeline = (
+        List(data=range(8))
+        >> Thread(func=func, workers=4, name='Worker')
+        >> Consumer(func=result.append)
+    )
+    await helpers.execute(pipeline)
+
+    assert sorted(result) == list(range(8))
+    assert max(peak) > 1
+    assert not [x for x in threading.enumerate() if x.name.startswith('Worker')]
+
+
+@pytest.mark.asyncio
+async def test_thread_workers_error(helpers):
+    with pytest.raises(ActorOptionValueError):
+        await helpers.execute(List() >> Thread(func=print, workers=0))
+
+
 def test_positional_argument_exception():
     with pytest.raises(ActorArgumentsError):
         Printer(1)
@@ -172,3 +268,348 @@ async def test_applicator_exception(helpers):
         await helpers.execute(pipeline)
 
     assert stream.getvalue() == '1.0\n'
+
+
+@pytest.mark.asyncio
+async def test_deep_flow(helpers):
+    stream = io.StringIO()
+
+    pipeline = List(data=[0, 1])
+    for _ in range(50):
+        pipeline = pipeline >> Applicator(func=lambda x: x + 1)
+    pipeline = pipeline >> Printer(stream=stream)
+    assert len(pipeline.plan()[0]) == 52
+    await helpers.execute(pipeline)
+
+    assert stream.getvalue() == '50\n51\n'
+
+
+@pytest.mark.asyncio
+async def test_cancel_finishes_all_actors():
+    stream = io.StringIO()
+
+    pipeline = (
+        List(data='a')
+        >> Repeat()
+        >= Take(limit=2)
+        >> Printer(stream=stream)
+    )
+    await asyncio.wait_for(pipeline.start(), 1)
+
+    assert stream.getvalue() == 'a\na\n'
+    assert asyncio.all_tasks() == {asyncio.current_task()}
+
+
+@pytest.mark.asyncio
+async def test_flow_cancellation():
+    pipeline = Ticker(timeout=0.01) >> Counter() >> Null()
+    task = asyncio.ensure_future(pipeline.start())
+    await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert asyncio.all_tasks() == {asyncio.current_task()}
+
+
+@pytest.mark.asyncio
+async def test_applicator_process(helpers):
+    stream = io.StringIO()
+
+    with concurrent.futures.ProcessPoolExecutor(2) as executor:
+        pipeline = (
+            List(data=[0, 1, 2, 3])
+            >> Filter(func=operator.truth, process=True, executor=executor)
+            >> Applicator(func=operator.neg, process=True, chunksize=2)
+            >> Printer(stream=stream)
+        )
+        await helpers.execute(pipeline)
+
+    assert stream.getvalue() == '-1\n-2\n-3\n'
+
+
+def test_applicator_process_picklable():
+    with pytest.raises(ApplicatorProcessError):
+        Applicator(func=lambda x: x, process=True)
+    with pytest.raises(ApplicatorProcessError):
+        Batcher(size=2, process=True)
+
+
+@pytest.mark.parametrize('actor', [
+    lambda: Take(limit=2, func=operator.neg, process=True),
+    lambda: Batcher(size=2, func=operator.neg, process=True),
+    lambda: Unbatch(func=operator.neg, process=True),
+])
+def test_applicator_process_own_func(actor):
+    # function of these actors is not applied, so it can not be offloaded
+    with pytest.raises(ApplicatorProcessError):
+        actor()
+
+
+@pytest.mark.parametrize('actor', [
+    lambda: Batcher(size=2),
+    lambda: Applicator(func=lambda x: x),
+])
+def test_applicator_process_configure(actor):
+    flow = List() >> actor() >> Null()
+    with pytest.raises(ApplicatorProcessError):
+        flow.configure([{}, {'process': True}])
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('ordered,expected', [
+    (True, '3\n2\n1\n0\n'),
+    (False, '0\n1\n2\n3\n'),
+])
+async def test_applicator_concurrency(helpers, ordered, expected):
+    active = []
+    window = []
+
+    async def func(x):
+        active.append(x)
+        window.append(len(active))
+        await asyncio.sleep(x * 0.02)
+        active.remove(x)
+        return x
+
+    stream = io.StringIO()
+    pipeline = (
+        List(data=[3, 2, 1, 0])
+        >> Applicator(func=func, concurrency=4, ordered=ordered)
+        >> Printer(stream=stream)
+    )
+    await helpers.execute(pipeline)
+
+    assert stream.getvalue() == expected
+    assert max(window) == 4
+
+
+@pytest.mark.asyncio
+async def test_applicator_concurrency_window(helpers):
+    window = []
+
+    async def func(x):
+        window.append(x)
+        await asyncio.sleep(0.01)
+        return x
+
+    stream = io.StringIO()
+    pipeline = (
+        List(data=range(10))
+        >> Applicator(func=func, concurrency=3)
+        >= Take(limit=4)
+        >> Printer(stream=stream)
+    )
+    await helpers.execute(pipeline)
+
+    assert stream.getvalue() == '0\n1\n2\n3\n'
+    assert len(window) < 10
+
+
+@pytest.mark.asyncio
+async def test_shard(helpers):
+    workers = []
+    result = []
+
+    def factory():
+        index = len(workers)
+        workers.append(index)
+        return Applicator(func=lambda x: (index, x))
+
+    pipeline = (
+        List(data=range(30))
+        >> Shard(workers=3, factory=factory, key=lambda x: x % 5)
+        >> Consumer(func=result.append)
+    )
+    await helpers.execute(pipeline)
+
+    assert workers == [0, 1, 2]
+    assert sorted(x for _, x in result) == list(range(30))
+    for key in range(5):
+        items = [(w, x) for w, x in result if x % 5 == key]
+        assert len({w for w, _ in items}) == 1
+        assert [x for _, x in items] == list(range(key, 30, 5))
+
+
+@pytest.mark.asyncio
+async def test_shard_threads(helpers):
+    def func(getter, putter):
+        while True:
+            data = getter()
+            if data is DATA_FINISH_MARKER:
+                break
+            putter(data * 2)
+        putter(DATA_FINISH_MARKER)
+
+    result = []
+    pipeline = (
+        List(data=range(10))
+        >> Shard(workers=2, factory=lambda: Thread(func=func))
+        >> Consumer(func=result.append)
+    )
+    await helpers.execute(pipeline)
+
+    assert sorted(result) == list(range(0, 20, 2))
+
+
+@pytest.mark.asyncio
+async def test_merge_first(helpers):
+    result = []
+    pipeline = (
+        Merge(sources=[
+            List(data=range(0, 10, 2)),
+            List(data=range(1, 10, 2)) >> Applicator(func=lambda x: x),
+        ])
+        >> Consumer(func=result.append)
+    )
+    await helpers.execute(pipeline)
+
+    assert sorted(result) == list(range(10))
+    assert [x for x in result if x % 2] == list(range(1, 10, 2))
+
+
+@pytest.mark.asyncio
+async def test_merge_round_robin(helpers):
+    result = []
+    pipeline = (
+        Merge(
+            sources=[List(data=[0, 2, 4, 6]), List(data=[1, 3])],
+            policy='round-robin',
+        )
+        >> Consumer(func=result.append)
+    )
+    await helpers.execute(pipeline)
+
+    assert result == [0, 1, 2, 3, 4, 6]
+
+
+@pytest.mark.asyncio
+async def test_merge_policy_error(helpers):
+    pipeline = Merge(sources=[List()], policy='unknown') >> Null()
+    with pytest.raises(ActorOptionValueError):
+        await helpers.execute(pipeline)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('policy,dropped,expected', [
+    ('drop', 97, [1, 2]),
+    ('sample', 98, [99, DATA_FINISH_MARKER]),
+])
+async def test_tee_slow_branch(helpers, policy, dropped, expected):
+    side = []
+    result = []
+
+    async def slow(x):
+        side.append(x)
+        await asyncio.sleep(10)
+
+    tee = Tee(sink=Consumer(func=slow), policy=policy, capacity=2)
+    pipeline = (
+        List(data=range(100))
+        >> tee
+        >> Consumer(func=result.append)
+    )
+    task = asyncio.ensure_future(pipeline.start())
+    await asyncio.sleep(0.1)
+
+    assert result == list(range(100))
+    assert side == [0]
+    queue, = tee.queues
+    assert queue.dropped == dropped
+    assert [queue.get_nowait() for _ in range(2)] == expected
+    task.cancel()
+    await helpers.finalize()
+
+
+@pytest.mark.asyncio
+async def test_tee_slow_branch_finish(helpers):
+    result = []
+    pipeline = (
+        List(data=range(5))
+        >> Tee(sink=Consumer(func=lambda x: asyncio.sleep(10)), policy='drop')
+        >> Batcher(size=10)
+        >> Consumer(func=result.append)
+    )
+    task = asyncio.ensure_future(pipeline.start())
+    await asyncio.sleep(0.1)
+
+    # partial batch is flushed by finish marker of main flow
+    assert result == [[0, 1, 2, 3, 4]]
+    assert not task.done()
+    task.cancel()
+    await helpers.finalize()
+
+
+@pytest.mark.asyncio
+async def test_tee_branches(helpers):
+    first = io.StringIO()
+    second = io.StringIO()
+    result = []
+
+    pipeline = (
+        List(data=[0, 1, 2])
+        >> Tee(
+            sink=Printer(stream=first),
+            sinks=[Branch(sink=Printer(stream=second), capacity=None)],
+        )
+        >> Consumer(func=result.append)
+    )
+    await helpers.execute(pipeline)
+
+    assert first.getvalue() == second.getvalue() == '0\n1\n2\n'
+    assert result == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_batcher_latency(helpers):
+    result = []
+
+    pipeline = (
+        Ticker(timeout=0.03, limit=4)
+        >> Counter()
+        >> Batcher(size=3, latency=0.01)
+        >> Consumer(func=result.append)
+    )
+    await helpers.execute(pipeline)
+
+    assert result == [[0], [1], [2], [3]]
+
+
+@pytest.mark.asyncio
+async def test_batcher_max_bytes(helpers):
+    result = []
+
+    pipeline = (
+        List(data=[b'a', b'bb', b'ccc', b'dddd', b'e'])
+        >> Batcher(size=3, max_bytes=4)
+        >> Consumer(func=result.append)
+    )
+    await helpers.execute(pipeline)
+
+    assert result == [[b'a', b'bb'], [b'ccc'], [b'dddd'], [b'e']]
+
+
+def test_batcher_max_bytes_reached():
+    batcher = Batcher(max_bytes=4)
+
+    # batches are flushed without waiting for next event
+    assert batcher.func(b'ab') is APPLICATOR_IGNORE
+    assert batcher.func(b'cd') == [b'ab', b'cd']
+    assert batcher.func(b'efghi') == [b'efghi']
+    assert batcher.func(b'j') is APPLICATOR_IGNORE
+    assert batcher.finish() == [b'j']
+
+
+@pytest.mark.asyncio
+async def test_unbatch(helpers):
+    stream = io.StringIO()
+
+    pipeline = (
+        List(data=[0, 1, 2, 3, 4])
+        >> Batcher(size=2, latency=1)
+        >> Unbatch()
+        >> Printer(stream=stream)
+    )
+    await helpers.execute(pipeline)
+
+    assert stream.getvalue() == '0\n1\n2\n3\n4\n'
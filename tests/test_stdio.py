@@ -0,0 +1,65 @@
+import os
+
+import pytest
+
+from aioflows.simple import Consumer, List
+from aioflows.stdio import Stdin, Stdout
+
+
+@pytest.fixture
+def pipe():
+    reader, writer = os.pipe()
+    with open(reader, 'rb') as reader, open(writer, 'wb') as writer:
+        yield reader, writer
+
+
+@pytest.mark.asyncio
+async def test_stdin_pipe(helpers, pipe):
+    reader, writer = pipe
+    writer.write(b'a\nbb\n\nccc')
+    writer.close()
+
+    result = []
+    pipeline = Stdin(file=reader, size=2) >> Consumer(func=result.append)
+    await helpers.execute(pipeline)
+
+    assert result == ['a', 'bb', '', 'ccc']
+    # pipe transport of duplicate does not leave file non-blocking
+    assert os.get_blocking(reader.fileno())
+
+
+@pytest.mark.asyncio
+async def test_stdin_file_binary(helpers, tmp_path):
+    path = tmp_path / 'input'
+    path.write_bytes(b'0123456789')
+
+    result = []
+    with open(path, 'rb') as file:
+        pipeline = (
+            Stdin(file=file, size=4, binary=True)
+            >> Consumer(func=result.append)
+        )
+        await helpers.execute(pipeline)
+
+    assert result == [b'0123', b'4567', b'89']
+
+
+@pytest.mark.asyncio
+async def test_stdout_pipe(helpers, pipe):
+    reader, writer = pipe
+    pipeline = List(data=['a', 1, None]) >> Stdout(file=writer)
+    await helpers.execute(pipeline)
+    assert os.get_blocking(writer.fileno())
+    writer.close()
+
+    assert reader.read() == b'a\n1\nNone\n'
+
+
+@pytest.mark.asyncio
+async def test_stdout_file_binary(helpers, tmp_path):
+    path = tmp_path / 'output'
+    with open(path, 'wb') as file:
+        pipeline = List(data=[b'ab', b'c']) >> Stdout(file=file, binary=True)
+        await helpers.execute(pipeline)
+
+    assert path.read_bytes() == b'abc'
@@ -0,0 +1,104 @@
+import time
+
+import pytest
+
+from aioflows.channels import ChannelMixinError
+from aioflows.metrics import instrument
+from aioflows.simple import Applicator, Consumer, Filter, List, Null, Tee
+from aioflows.trace import Histogram, Tracer, trace
+
+
+def slow(data):
+    time.sleep(0.001)
+    return data * 2
+
+
+@pytest.mark.asyncio
+async def test_trace(helpers):
+    result = []
+    pipeline = (
+        List(data=range(100))
+        >> Applicator(func=slow)
+        >> Filter(func=lambda x: x % 4)
+        >> Consumer(func=result.append)
+    )
+    tracer = trace(pipeline, Tracer(every=10))
+    metrics = instrument(pipeline)
+    await helpers.execute(pipeline)
+    snapshot = tracer.snapshot()
+
+    # envelopes are transparent to actors and other instrumentation
+    assert result == [x * 2 for x in range(100) if x % 2]
+    assert sum(x['events'] for x in metrics.snapshot()['edges'].values()) == 250
+
+    # events 9, 19, ... are traced and all of them pass the filter
+    latency = snapshot['latency']
+    assert latency['count'] == 10
+    assert 0 < latency['p50'] <= latency['p99']
+    assert latency['max'] >= 0.001
+    assert list(snapshot['hops']) == [
+        'List[0] >> Applicator[1]',
+        'Applicator[1]',
+        'Applicator[1] >> Filter[2]',
+        'Filter[2]',
+        'Filter[2] >> Consumer[3]',
+    ]
+    assert snapshot['hops']['Applicator[1]']['mean'] >= 0.001
+    assert all(x['count'] == 10 for x in snapshot['hops'].values())
+
+
+@pytest.mark.asyncio
+async def test_trace_filtered(helpers):
+    pipeline = (
+        List(data=range(100))
+        >> Filter(func=lambda x: x % 2 == 0)
+        >> Null()
+    )
+    tracer = trace(pipeline, Tracer(every=10))
+    await helpers.execute(pipeline)
+
+    # traced events are odd, so none of them reaches the sink
+    assert tracer.snapshot()['latency']['count'] == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('actor,expected', [
+    (lambda: Applicator(func=str), 1000),
+    (lambda: Filter(func=lambda x: x % 2), 1000),
+    (lambda: Filter(func=lambda x: x % 2 == 0), 0),
+    (lambda: Tee(sink=Null()), 1000),
+    (lambda: Applicator(func=str, thread=True, chunksize=16), 1000),
+])
+async def test_trace_unbounded(helpers, actor, expected):
+    # actors receive events in chunks from unbounded channels
+    pipeline = (
+        List(data=range(10000))
+        .connect(actor(), capacity=None)
+        .connect(Null(), capacity=None)
+    )
+    tracer = trace(pipeline, Tracer(every=10))
+    await helpers.execute(pipeline)
+
+    assert tracer.snapshot()['latency']['count'] == expected
+
+
+def test_trace_twice():
+    pipeline = List() >> Null()
+    trace(pipeline)
+    instrument(pipeline)
+    with pytest.raises(ChannelMixinError):
+        trace(pipeline)
+    with pytest.raises(ChannelMixinError):
+        instrument(pipeline)
+
+
+def test_histogram():
+    histogram = Histogram(start=1, factor=10, size=3)
+    for value in (0.5, 5, 5, 50, 500):
+        histogram.add(value)
+    snapshot = histogram.snapshot()
+
+    assert snapshot['count'] == 5
+    assert snapshot['p50'] == 10
+    assert snapshot['p99'] == 500
+    assert snapshot['buckets'] == [(1, 1), (10, 2), (100, 1), (float('inf'), 1)]
@@ -0,0 +1,104 @@
+import asyncio
+import types
+
+import pytest
+from zeroconf import ServiceStateChange
+
+import aioflows.zeroconf
+from aioflows.simple import Consumer
+from aioflows.zeroconf import Zeroconf
+
+
+class FakeInfo:
+    """Stand-in of AsyncServiceInfo resolving after short delay."""
+
+    requests = []
+
+    def __init__(self, service_type, name):
+        self.name = name
+        self.port = None
+
+    async def async_request(self, zeroconf, timeout):
+        self.requests.append(self.name)
+        await asyncio.sleep(0.01)
+        self.port = len(self.requests)
+        return not self.name.startswith('lost')
+
+
+class FakeBrowser:
+    """Stand-in of AsyncServiceBrowser firing prepared changes."""
+
+    changes = []
+
+    def __init__(self, zeroconf, service_type, handlers):
+        for state_change, name in self.changes:
+            asyncio.get_running_loop().call_soon(
+                lambda state_change=state_change, name=name: [
+                    handler(
+                        zeroconf=zeroconf,
+                        service_type=service_type,
+                        name=name,
+                        state_change=state_change,
+                    )
+                    for handler in handlers
+                ],
+            )
+
+    async def async_cancel(self):
+        pass
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    monkeypatch.setattr(aioflows.zeroconf, 'AsyncServiceInfo', FakeInfo)
+    monkeypatch.setattr(aioflows.zeroconf, 'AsyncServiceBrowser', FakeBrowser)
+    FakeInfo.requests = []
+    return types.SimpleNamespace(zeroconf=None)
+
+
+@pytest.mark.asyncio
+async def test_zeroconf(helpers, fake):
+    FakeBrowser.changes = [
+        (ServiceStateChange.Added, 'a'),
+        (ServiceStateChange.Added, 'b'),
+        (ServiceStateChange.Added, 'lost'),
+        (ServiceStateChange.Removed, 'a'),
+        (ServiceStateChange.Updated, 'b'),
+    ]
+    result = []
+    source = Zeroconf(service_type='_test._tcp.local.', zeroconf=fake)
+    pipeline = source >> Consumer(
+        func=lambda x: result.append((x[0], x[1].name)),
+    )
+    task = asyncio.ensure_future(pipeline.start())
+    await asyncio.sleep(0.05)
+
+    # removed before resolution, so neither added nor removed
+    assert result == [('add', 'b'), ('update', 'b')]
+    assert sorted(FakeInfo.requests) == ['b', 'lost']
+
+    # cached and concurrent lookups do not send requests
+    infos = await asyncio.gather(
+        source.lookup('_test._tcp.local.', 'b'),
+        source.lookup('_test._tcp.local.', 'c'),
+        source.lookup('_test._tcp.local.', 'c'),
+    )
+    assert [x.name for x in infos] == ['b', 'c', 'c']
+    assert infos[1] is infos[2]
+    assert sorted(FakeInfo.requests) == ['b', 'c', 'lost']
+    assert not task.done()
+    await helpers.finalize()
+
+
+@pytest.mark.asyncio
+async def test_zeroconf_cache_ttl(helpers, fake):
+    FakeBrowser.changes = []
+    source = Zeroconf(service_type='_test._tcp.local.', zeroconf=fake, ttl=0)
+    task = asyncio.ensure_future(source.start())
+    await asyncio.sleep(0)
+    await source.lookup('_test._tcp.local.', 'a')
+    await source.lookup('_test._tcp.local.', 'a')
+
+    assert FakeInfo.requests == ['a', 'a']
+    assert not task.done()
+    await helpers.finalize()